@@ -0,0 +1,62 @@
+"""Shared helpers for the syslog_receiver benchmarks.
+
+The benchmarks exercise the receive path without a Home Assistant install:
+the integration package is registered without executing its ``__init__``
+(which imports Home Assistant), and ``hass`` is replaced by a minimal stand-in
+that only records fired events.
+"""
+import importlib
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "syslog_receiver"
+PACKAGE = "syslog_receiver"
+
+
+def load_module(name: str):
+    """Import ``syslog_receiver.<name>`` without running the package __init__."""
+    if PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            PACKAGE,
+            PACKAGE_DIR / "__init__.py",
+            submodule_search_locations=[str(PACKAGE_DIR)],
+        )
+        sys.modules[PACKAGE] = importlib.util.module_from_spec(spec)
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+class FakeBus:
+    """Event bus stand-in that counts fired events."""
+
+    def __init__(self):
+        self.fired = 0
+        self.last = None
+
+    def async_fire(self, event_type, event_data=None):
+        self.fired += 1
+        self.last = (event_type, event_data)
+
+
+class FakeHass:
+    """The subset of HomeAssistant used by SyslogServer."""
+
+    def __init__(self, loop=None):
+        self.bus = FakeBus()
+        self.data = {}
+        self.loop = loop
+
+    def async_add_executor_job(self, target, *args):
+        return self.loop.run_in_executor(None, target, *args)
+
+
+def rate(func, messages, repeat=5):
+    """Run func over messages `repeat` times and return the best messages/sec."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data, addr in messages:
+            func(data, addr)
+        best = min(best, time.perf_counter() - start)
+    return len(messages) / best
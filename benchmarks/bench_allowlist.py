@@ -0,0 +1,50 @@
+"""Microbenchmark of allowed_ips lookups with a large list of subnets.
+
+Measures the sorted-interval index of AllowList against a linear scan over
+the same networks. The per-source cache is disabled so every lookup hits the
+index.
+
+    python benchmarks/bench_allowlist.py [--subnets N] [--count N]
+"""
+import argparse
+import ipaddress
+import logging
+import random
+import time
+
+from _common import load_module
+
+allowlist = load_module("allowlist")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subnets", type=int, default=500)
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rnd = random.Random(1)
+    nets = [f"10.{rnd.randint(0, 255)}.{rnd.randint(0, 255)}.0/24" for _ in range(args.subnets)]
+    nets += [f"2001:db8:{rnd.randint(0, 0xffff):x}::/48" for _ in range(args.subnets // 5)]
+    sources = [f"10.{rnd.randint(0, 255)}.{rnd.randint(0, 255)}.{rnd.randint(1, 254)}" for _ in range(args.count)]
+
+    matcher = allowlist.AllowList(", ".join(nets))
+    allowlist.CACHE_SIZE = 0  # force the index lookup on every call
+    start = time.perf_counter()
+    hits = sum(1 for src in sources if src in matcher)
+    indexed = time.perf_counter() - start
+
+    parsed = [ipaddress.ip_network(n) for n in nets]
+    sample = sources[: max(1, args.count // 20)]
+    start = time.perf_counter()
+    linear_hits = sum(1 for src in sample if any(ipaddress.ip_address(src) in n for n in parsed))
+    linear = (time.perf_counter() - start) * len(sources) / len(sample)
+
+    print(f"{len(nets)} networks, {args.count:,} lookups, {hits:,} allowed")
+    print(f"linear scan:    {args.count / linear:12,.0f} lookups/s (sampled, {linear_hits:,} allowed in sample)")
+    print(f"interval index: {args.count / indexed:12,.0f} lookups/s")
+
+
+if __name__ == "__main__":
+    main()
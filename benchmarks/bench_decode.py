@@ -0,0 +1,53 @@
+"""Lazy decoding: FilterPipeline.prepare with and without the raw-bytes header check.
+
+For each minimum severity the corpus message mix is run through prepare()
+twice: once decoding every payload before reading its <PRI> header (the
+previous behaviour, forced by disabling the raw-bytes match), and once with
+the header read from the bytes so dropped messages are never decoded and
+accepted ones only have their body decoded.
+
+    python benchmarks/bench_decode.py [--count N]
+"""
+import argparse
+import logging
+import time
+
+from _common import load_module
+from loadgen import message_mix
+
+pipeline_mod = load_module("pipeline")
+
+LEVELS = ("debug", "info", "notice", "warning", "err")
+
+
+def best_rate(pipeline, messages, repeat=5):
+    prepare = pipeline.prepare
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for data in messages:
+            prepare(data, "10.0.0.1")
+        best = min(best, time.perf_counter() - start)
+    return len(messages) / best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=50_000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    messages = message_mix(args.count)
+    print(f"{'min severity':13} {'dropped':>8} {'decode first':>14} {'lazy':>14} {'speed-up':>9}")
+    for level in LEVELS:
+        lazy = pipeline_mod.FilterPipeline("utf-8", "", level)
+        eager = pipeline_mod.FilterPipeline("utf-8", "", level)
+        eager.raw_pri = None
+        dropped = sum(1 for data in messages if lazy.prepare(data, "10.0.0.1") is None) / len(messages)
+        eager_rate = best_rate(eager, messages)
+        lazy_rate = best_rate(lazy, messages)
+        print(f"{level:13} {dropped:8.0%} {eager_rate:10,.0f} /s {lazy_rate:10,.0f} /s {lazy_rate / eager_rate:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""End-to-end throughput of SyslogServer over loopback UDP, TCP and TLS.
+
+For every protocol a SyslogServer is started against the FakeHass stand-in on
+a loopback port and fed by loadgen.py sender processes with the corpus message
+mix. TLS runs use a self-signed certificate generated for the run. Reported per
+run: messages and events per second, p50/p99 processing time, drop rate by
+reason and the resident memory of the receiver process. Use --json to write
+the results in a machine-readable form for comparing releases.
+
+    python benchmarks/bench_e2e.py [--protocols udp,tcp,tls] [--seconds S] [--rate N]
+        [--senders N] [--min-severity LEVEL] [--option key=value ...] [--json FILE|-]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import platform
+import resource
+import sys
+import tempfile
+import time
+
+from _common import FakeHass, load_module
+from loadgen import make_self_signed_cert, send_stream, send_udp
+
+server_mod = load_module("server")
+
+PORT = 55150
+
+# Give up waiting for the receiver to drain after this many seconds
+DRAIN_TIMEOUT = 5.0
+
+
+def rss_bytes():
+    """Current and peak resident set size of this process."""
+    current = None
+    try:
+        with open("/proc/self/statm", encoding="ascii") as statm:
+            current = int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform != "darwin":
+        peak *= 1024  # kilobytes on Linux
+    return current, peak
+
+
+def parse_option(text: str):
+    key, _, value = text.partition("=")
+    try:
+        return key, json.loads(value)
+    except ValueError:
+        return key, value
+
+
+async def wait_drained(server, sent: int):
+    """Wait until every sent message is accounted for, or the counters stop moving."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + DRAIN_TIMEOUT
+    last = -1
+    while loop.time() < deadline:
+        received = server.stats.received + server.dropped_backlog
+        if received >= sent or received == last:
+            return
+        last = received
+        await asyncio.sleep(0.2)
+
+
+async def run(protocol: str, args, options: dict, certs):
+    loop = asyncio.get_running_loop()
+    hass = FakeHass(loop)
+    config = {
+        "instance_name": f"bench {protocol}",
+        "listeners": f"{protocol}://127.0.0.1:{PORT}",
+        "min_severity": args.min_severity,
+        "udp_rcvbuf": 4 << 20,
+        "certfile": certs[0] if certs else "",
+        "keyfile": certs[1] if certs else "",
+        **options,
+    }
+    server = server_mod.SyslogServer(hass, config, {})
+    await server.start()
+
+    counter = multiprocessing.Value("q", 0)
+    senders = []
+    for seed in range(args.senders):
+        if protocol == "udp":
+            target, extra = send_udp, {}
+        else:
+            target, extra = send_stream, {"tls": protocol == "tls", "octet_counting": args.octet_counting}
+        senders.append(multiprocessing.Process(
+            target=target,
+            args=("127.0.0.1", PORT, args.seconds, args.rate / args.senders, counter),
+            kwargs={"seed": seed + 1, **extra},
+        ))
+
+    start = time.perf_counter()
+    for sender in senders:
+        sender.start()
+    for sender in senders:
+        await loop.run_in_executor(None, sender.join)
+    await wait_drained(server, counter.value)
+    elapsed = time.perf_counter() - start
+    stats = await loop.run_in_executor(None, server.get_stats)
+    rss, rss_peak = rss_bytes()
+    await server.stop()
+
+    sent = counter.value
+    lost = max(sent - stats["received"] - stats["dropped_backlog"], 0)
+    return {
+        "protocol": protocol,
+        "seconds": round(elapsed, 3),
+        "sent": sent,
+        "received": stats["received"],
+        "accepted": stats["accepted"],
+        "events": hass.bus.fired,
+        "msgs_per_sec": round(stats["received"] / elapsed),
+        "events_per_sec": round(hass.bus.fired / elapsed),
+        "latency_p50_us": stats["latency_p50_us"],
+        "latency_p99_us": stats["latency_p99_us"],
+        "lost": lost,
+        "udp_kernel_drops": stats["udp_kernel_drops"],
+        "dropped": stats["dropped"],
+        "drop_rate": round((lost + stats["dropped"]) / sent, 4) if sent else None,
+        "loss_rate": round(lost / sent, 4) if sent else None,
+        "rss_bytes": rss,
+        "rss_peak_bytes": rss_peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--protocols", default="udp,tcp,tls")
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--rate", type=float, default=0, help="total messages/s, 0 = as fast as possible")
+    parser.add_argument("--senders", type=int, default=1, help="sender processes (TCP/TLS: one connection each)")
+    parser.add_argument("--min-severity", default="debug")
+    parser.add_argument("--octet-counting", action="store_true", help="RFC 6587 octet counting on TCP/TLS")
+    parser.add_argument("--option", action="append", default=[], metavar="KEY=VALUE",
+                        help="extra SyslogServer option, value parsed as JSON if possible")
+    parser.add_argument("--json", metavar="FILE", help="write the results as JSON to FILE ('-' for stdout)")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+    options = dict(parse_option(text) for text in args.option)
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        protocols = args.protocols.split(",")
+        certs = make_self_signed_cert(tmp) if "tls" in protocols else None
+        for protocol in protocols:
+            results.append(asyncio.run(run(protocol, args, options, certs)))
+
+    report = {
+        "benchmark": "syslog_receiver_e2e",
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpus": os.cpu_count(),
+        "parameters": {
+            "seconds": args.seconds, "rate": args.rate, "senders": args.senders,
+            "min_severity": args.min_severity, "octet_counting": args.octet_counting, "options": options,
+        },
+        "results": results,
+    }
+    if args.json:
+        text = json.dumps(report, indent=2)
+        if args.json == "-":
+            print(text)
+            return
+        with open(args.json, "w", encoding="utf-8") as file:
+            file.write(text + "\n")
+
+    print(f"{'proto':6} {'sent':>10} {'msgs/s':>10} {'events/s':>10} {'p50 µs':>7} {'p99 µs':>7} "
+          f"{'lost':>7} {'drop %':>7} {'RSS MiB':>8}")
+    for r in results:
+        print(f"{r['protocol']:6} {r['sent']:10,} {r['msgs_per_sec']:10,} {r['events_per_sec']:10,} "
+              f"{str(r['latency_p50_us']):>7} {str(r['latency_p99_us']):>7} {r['lost']:7,} "
+              f"{(r['drop_rate'] or 0) * 100:7.2f} {(r['rss_bytes'] or 0) / 2**20:8.1f}")
+
+
+if __name__ == "__main__":
+    main()
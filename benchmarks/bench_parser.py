@@ -0,0 +1,42 @@
+"""Throughput of the RFC 5424 / RFC 3164 header parser on real device formats.
+
+Runs the device corpus through parser.parse with warm header caches and with
+the caches cleared before every message.
+
+    python benchmarks/bench_parser.py [--count N]
+"""
+import argparse
+import time
+
+from _common import load_module
+from corpus import CORPUS
+
+parser = load_module("parser")
+pipeline = load_module("pipeline")
+
+
+def run(lines, count, cold):
+    texts = [pipeline.PRI_RE.match(line).group(2) for line in lines]
+    texts = (texts * (count // len(texts) + 1))[:count]
+    start = time.perf_counter()
+    for text in texts:
+        if cold:
+            parser.cache_clear()
+        parser.parse(text)
+    return count / (time.perf_counter() - start)
+
+
+def main():
+    argparser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    argparser.add_argument("--count", type=int, default=100_000)
+    args = argparser.parse_args()
+
+    print(f"{'device':10} {'cold cache':>14} {'warm cache':>14}")
+    for device, lines in CORPUS.items():
+        cold = run(lines, args.count // 4, cold=True)
+        warm = run(lines, args.count, cold=False)
+        print(f"{device:10} {cold:10,.0f} msg/s {warm:10,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
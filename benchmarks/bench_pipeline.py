@@ -0,0 +1,91 @@
+"""Microbenchmark of SyslogServer.process_message.
+
+Compares the compiled filter pipeline with the previous implementation, which
+looked up every option and re-split ``allowed_ips`` for each packet.
+
+    python benchmarks/bench_pipeline.py [--count N]
+"""
+import argparse
+import logging
+import random
+import re
+
+from _common import FakeHass, load_module, rate
+
+const = load_module("const")
+server_mod = load_module("server")
+
+CONFIG = {
+    "protocol": "UDP",
+    "encoding": "utf-8",
+    "allowed_ips": ", ".join(f"10.0.0.{i}" for i in range(1, 21)),
+    "min_severity": "warning",
+}
+
+
+class LegacyServer:
+    """process_message as it was before the compiled pipeline."""
+
+    def __init__(self, hass, config, options):
+        self.hass = hass
+        self.config = config
+        self.options = options
+        self.sensors = []
+
+    def __get_option(self, key, default=None):
+        return self.options.get(key, self.config.get(key, default))
+
+    def process_message(self, data, addr):
+        encoding = self.__get_option("encoding", None)
+        try:
+            if encoding:
+                message = data.decode(encoding, errors="replace").strip()
+            else:
+                message = data.decode(errors="replace").strip()
+        except LookupError:
+            message = data.decode(errors="replace").strip()
+        src_ip = addr[0]
+        raw_ips = self.__get_option("allowed_ips", "")
+        ips = [ip.strip() for ip in raw_ips.split(",") if ip.strip()]
+        if ips and src_ip not in ips:
+            return
+        m = re.match(r"<(\d+)>(.*)", message)
+        if m:
+            severity = int(m.group(1)) & 0x07
+            min_level = const.MIN_SEVERITY_LEVELS.get(self.__get_option("min_severity", "info"), 6)
+            if severity > min_level:
+                return
+            body = m.group(2).strip()
+        else:
+            severity = None
+            body = message
+        self.hass.bus.async_fire(f"{const.DOMAIN}_message", {"message": body, "source_ip": src_ip, "severity": severity})
+
+
+def make_messages(count, seed=1):
+    rnd = random.Random(seed)
+    messages = []
+    for i in range(count):
+        # 90% of the traffic comes from allowed hosts, severities spread 0..7
+        host = f"10.0.0.{rnd.randint(1, 22)}"
+        pri = 8 * rnd.randint(0, 23) + rnd.randint(0, 7)
+        data = f"<{pri}>Oct 18 10:00:{i % 60:02d} fw01 kernel: DROP IN=eth0 SRC=192.0.2.{i % 255} DPT=443\n"
+        messages.append((data.encode(), (host, 514)))
+    return messages
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    messages = make_messages(args.count)
+    before = rate(LegacyServer(FakeHass(), CONFIG, {}).process_message, messages)
+    after = rate(server_mod.SyslogServer(FakeHass(), CONFIG, {}).process_message, messages)
+    print(f"before: {before:12,.0f} msg/s")
+    print(f"after:  {after:12,.0f} msg/s  ({after / before:.2f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""Microbenchmark of routing rule matching with a growing number of rules.
+
+Measures the compiled RuleSet against a first-match linear scan over the same
+rules. A third of the rules match on source, a third on app name plus a
+keyword and a third on a regex; the routed messages mostly match none of them,
+which is the common case on a busy receiver.
+
+    python benchmarks/bench_rules.py [--rules N ...] [--count N]
+"""
+import argparse
+import logging
+import random
+import re
+import time
+
+from _common import load_module
+
+rules_mod = load_module("rules")
+
+
+def build_rules(n: int) -> str:
+    rules = []
+    for i in range(n):
+        kind = i % 3
+        if kind == 0:
+            rules.append(f"source=10.0.{i // 250}.{i % 250 + 1} -> src{i}")
+        elif kind == 1:
+            rules.append(f'app_name=app{i} keyword="token{i} " -> kw{i}')
+        else:
+            rules.append(f'regex="fault{i}: code [0-9]+" -> re{i}')
+    return "; ".join(rules)
+
+
+def linear_route(rules, event_data):
+    message = event_data["message"]
+    for rule in rules:
+        if "source" in rule.exact and event_data["source_ip"] not in rule.exact["source"]:
+            continue
+        if "app_name" in rule.exact and event_data["app_name"] not in rule.exact["app_name"]:
+            continue
+        if rule.keyword is not None and rule.keyword not in message:
+            continue
+        if rule.regex is not None and not re.search(rule.regex, message):
+            continue
+        return rule.event_type
+    return rules_mod.EVENT_MESSAGE
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--count", type=int, default=100_000)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    rnd = random.Random(1)
+    events = [
+        {
+            "message": f"interface ge-0/0/{rnd.randint(0, 47)} changed state to {rnd.choice(('up', 'down'))}",
+            "source_ip": f"192.168.{rnd.randint(0, 3)}.{rnd.randint(1, 254)}",
+            "severity": rnd.randint(0, 7),
+            "facility": rnd.randint(0, 23),
+            "hostname": "switch",
+            "app_name": f"app{rnd.randint(0, 2000)}",
+        }
+        for _ in range(args.count)
+    ]
+
+    for n in args.rules:
+        rules, invalid = rules_mod.parse_rules(build_rules(n))
+        assert not invalid, invalid
+        ruleset = rules_mod.RuleSet(rules)
+
+        start = time.perf_counter()
+        routed = [ruleset.route(event) for event in events]
+        indexed = time.perf_counter() - start
+
+        sample = events[: max(1, args.count // 50)]
+        start = time.perf_counter()
+        expected = [linear_route(rules, event) for event in sample]
+        linear = (time.perf_counter() - start) * len(events) / len(sample)
+        assert expected == routed[: len(sample)]
+
+        print(f"{n:5} rules: linear scan {args.count / linear:12,.0f} msg/s (sampled), "
+              f"compiled {args.count / indexed:12,.0f} msg/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Startup cost of the receiver: module imports and starting several entries.
+
+Two measurements, each in a fresh interpreter so nothing is cached:
+
+- import: time to import the receive path (the server module and what it
+  pulls in) after the standard library modules Home Assistant has already
+  loaded by the time integrations are set up, and whether any config flow
+  module came along
+- start: time to create and start --entries receivers, each with a UDP, a TCP
+  and a TLS listener, the longest stall of the event loop meanwhile, and the
+  calls made on the event loop thread that Home Assistant reports as blocking
+  (file opens, name resolution, certificate loading).
+
+Both are repeated --repeat times and the medians are reported.
+
+    python benchmarks/bench_startup.py [--entries N] [--repeat N] [--uvloop]
+"""
+import argparse
+import asyncio
+import json
+import statistics
+import builtins
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+from loadgen import make_self_signed_cert
+
+PORT = 55170
+
+# Already imported by Home Assistant core before any integration is loaded
+HA_PRELOADED = ("asyncio", "concurrent.futures", "json", "logging", "re", "socket", "ssl")
+
+IMPORT_PROBE = """
+import importlib, json, sys, time
+for name in {preloaded!r}:
+    importlib.import_module(name)
+from _common import load_module
+start = time.perf_counter()
+load_module("server")
+elapsed = time.perf_counter() - start
+modules = sorted(name for name in sys.modules if name.startswith("syslog_receiver."))
+print(json.dumps({{"ms": elapsed * 1000, "modules": modules}}))
+"""
+
+
+# Calls Home Assistant flags when they run in the event loop
+BLOCKING_CALLS = (
+    (builtins, "open"),
+    (socket, "getaddrinfo"),
+    (ssl.SSLContext, "load_cert_chain"),
+    (ssl.SSLContext, "load_default_certs"),
+    (ssl.SSLContext, "load_verify_locations"),
+)
+
+
+def count_blocking_calls(calls: Counter):
+    """Wrap BLOCKING_CALLS to count the ones made from the calling thread."""
+    loop_thread = threading.get_ident()
+    for owner, name in BLOCKING_CALLS:
+        original = getattr(owner, name)
+
+        def wrapper(*args, __original=original, __name=name, **kwargs):
+            if threading.get_ident() == loop_thread:
+                calls[__name] += 1
+            return __original(*args, **kwargs)
+
+        setattr(owner, name, wrapper)
+
+
+async def watch_loop(stalls: list, stop: asyncio.Event):
+    """Record the longest time the loop did not get back to this task."""
+    loop = asyncio.get_running_loop()
+    last = loop.time()
+    while not stop.is_set():
+        await asyncio.sleep(0.001)
+        now = loop.time()
+        stalls.append(now - last - 0.001)
+        last = now
+
+
+async def start_entries(count: int, certs):
+    from _common import FakeHass, load_module
+
+    server_mod = load_module("server")
+    loop = asyncio.get_running_loop()
+    stalls = []
+    stop = asyncio.Event()
+    # A running Home Assistant has used its executor and resolved names long before
+    await loop.getaddrinfo("localhost", None)
+    watcher = loop.create_task(watch_loop(stalls, stop))
+    await asyncio.sleep(0.01)
+    calls = Counter()
+    count_blocking_calls(calls)
+
+    servers = []
+    start = time.perf_counter()
+    for i in range(count):
+        port = PORT + 3 * i
+        server = server_mod.SyslogServer(FakeHass(loop), {
+            "instance_name": f"bench {i}",
+            "listeners": f"udp://127.0.0.1:{port}, tcp://127.0.0.1:{port + 1}, tls://127.0.0.1:{port + 2}",
+            "certfile": certs[0],
+            "keyfile": certs[1],
+        }, {})
+        await server.start()
+        servers.append(server)
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await watcher
+    for server in servers:
+        await server.stop()
+    return {"ms": elapsed * 1000, "max_stall_ms": max(stalls) * 1000, "blocking_calls": dict(calls)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=9)
+    parser.add_argument("--uvloop", action="store_true", help="run the event loop on uvloop (must be installed)")
+    parser.add_argument("--child", nargs=2, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        if args.uvloop:
+            import uvloop
+            asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+        print(json.dumps(asyncio.run(start_entries(args.entries, args.child))))
+        return
+
+    imports = []
+    for _ in range(args.repeat):
+        probe = subprocess.run(
+            [sys.executable, "-c", IMPORT_PROBE.format(preloaded=HA_PRELOADED)],
+            capture_output=True, text=True, check=True, cwd=sys.path[0],
+        )
+        imports.append(json.loads(probe.stdout))
+    modules = imports[0]["modules"]
+    flow_modules = [name for name in modules if name.endswith(("config_flow", "options_flow"))]
+    print(f"import server:     {statistics.median(r['ms'] for r in imports):7.1f} ms, {len(modules)} modules, "
+          f"config flow modules: {', '.join(flow_modules) or 'none'}")
+
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        certs = make_self_signed_cert(tmp)
+        child = [sys.executable, __file__, "--entries", str(args.entries), "--child", *certs]
+        if args.uvloop:
+            child.append("--uvloop")
+        for _ in range(args.repeat):
+            runs.append(json.loads(subprocess.run(child, capture_output=True, text=True, check=True).stdout))
+    print(f"start {args.entries} entries:  {statistics.median(r['ms'] for r in runs):7.1f} ms, "
+          f"longest event loop stall {statistics.median(r['max_stall_ms'] for r in runs):.1f} ms")
+    blocking = ", ".join(f"{name} x{count}" for name, count in sorted(runs[0]["blocking_calls"].items()))
+    print(f"blocking calls on the event loop: {blocking or 'none'}")
+
+
+if __name__ == "__main__":
+    main()
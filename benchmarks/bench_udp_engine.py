@@ -0,0 +1,80 @@
+"""Receive cost of the two UDP engines, without the rest of the pipeline.
+
+A sender process floods a loopback socket while the receiver runs one of the
+engines with a process_message() that only counts. Reported per engine: the
+datagrams received per second and the receiver CPU time per datagram, which
+does not depend on how much CPU the sender takes away.
+
+    python benchmarks/bench_udp_engine.py [--seconds S]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import socket
+import time
+
+from _common import load_module
+from loadgen import send_udp
+
+server_mod = load_module("server")
+
+PORT = 55160
+
+
+class CountingServer:
+    """Stands in for SyslogServer: counts datagrams and bytes."""
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+
+    def process_message(self, data, addr):
+        self.count += 1
+        self.bytes += len(data)
+
+
+async def measure(engine: str, seconds: float):
+    loop = asyncio.get_running_loop()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4 << 20)
+    sock.bind(("127.0.0.1", PORT))
+    sock.setblocking(False)
+    server = CountingServer()
+    if engine == "batch":
+        transport = server_mod.SyslogUDPBatchReader(loop, sock, server)
+    else:
+        transport, _ = await loop.create_datagram_endpoint(lambda: server_mod.SyslogUDPProtocol(server), sock=sock)
+
+    counter = multiprocessing.Value("q", 0)
+    sender = multiprocessing.Process(target=send_udp, args=("127.0.0.1", PORT, seconds, 0, counter))
+    cpu = time.process_time()
+    start = time.perf_counter()
+    sender.start()
+    await loop.run_in_executor(None, sender.join)
+    await asyncio.sleep(0.2)
+    elapsed = time.perf_counter() - start
+    cpu = time.process_time() - cpu
+    transport.close()
+    return {
+        "sent": counter.value,
+        "received": server.count,
+        "per_sec": server.count / elapsed,
+        "cpu_us": cpu / max(server.count, 1) * 1e6,
+        "batch": transport.datagrams / max(transport.batches, 1) if engine == "batch" else 1.0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    args = parser.parse_args()
+
+    print(f"{'engine':9} {'sent':>10} {'received':>10} {'recv/s':>10} {'CPU µs/dgram':>13} {'avg batch':>10}")
+    for engine in ("protocol", "batch"):
+        r = asyncio.run(measure(engine, args.seconds))
+        print(f"{engine:9} {r['sent']:10,} {r['received']:10,} {r['per_sec']:10,.0f} "
+              f"{r['cpu_us']:13.2f} {r['batch']:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Event loop lag with and without the off-loop worker pool.
+
+A separate process floods a local UDP listener with a realistic message mix
+while a ticker coroutine measures how late the event loop wakes it up. This is
+the lag every other Home Assistant task would see. Worker processes can only
+lower it when the host has CPU cores to spare, so the CPU count is printed too.
+
+    python benchmarks/bench_workers.py [--seconds S] [--modes off,process]
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import socket
+import statistics
+import time
+
+from _common import FakeHass, load_module
+from corpus import CORPUS
+
+server_mod = load_module("server")
+
+PORT = 55140
+TICK = 0.005
+
+
+def flood(port, seconds):
+    lines = [line.encode() for lines in CORPUS.values() for line in lines]
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    deadline = time.monotonic() + seconds
+    i = 0
+    while time.monotonic() < deadline:
+        sock.sendto(lines[i % len(lines)], ("127.0.0.1", port))
+        i += 1
+        if i % 64 == 0:
+            time.sleep(0)  # let the receiver breathe a little
+
+
+async def measure(mode, workers, seconds):
+    loop = asyncio.get_running_loop()
+    hass = FakeHass(loop)
+    config = {
+        "protocol": "UDP", "host": "127.0.0.1", "port": PORT,
+        "worker_mode": mode, "worker_count": workers, "udp_rcvbuf": 4 << 20,
+    }
+    server = server_mod.SyslogServer(hass, config, {})
+    await server.start()
+    sender = multiprocessing.Process(target=flood, args=(PORT, seconds))
+    sender.start()
+
+    lags = []
+    deadline = loop.time() + seconds
+    while loop.time() < deadline:
+        before = loop.time()
+        await asyncio.sleep(TICK)
+        lags.append((loop.time() - before - TICK) * 1000)
+    await loop.run_in_executor(None, sender.join)
+    await asyncio.sleep(0.5)  # let the workers drain
+    await server.stop()
+
+    lags.sort()
+    return {
+        "events/s": hass.bus.fired / seconds,
+        "lag p50 ms": statistics.median(lags),
+        "lag p99 ms": lags[int(len(lags) * 0.99) - 1],
+        "lag max ms": lags[-1],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--modes", default="off,process")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    print(f"{os.cpu_count()} CPU(s), {args.workers} worker(s)")
+    print(f"{'mode':8} {'events/s':>10} {'lag p50 ms':>11} {'lag p99 ms':>11} {'lag max ms':>11}")
+    for mode in args.modes.split(","):
+        result = asyncio.run(measure(mode, args.workers, args.seconds))
+        print(f"{mode:8} {result['events/s']:10,.0f} {result['lag p50 ms']:11.2f} "
+              f"{result['lag p99 ms']:11.2f} {result['lag max ms']:11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,28 @@
+"""Sample syslog lines as sent by common devices, used by the benchmarks."""
+
+CORPUS = {
+    "mikrotik": [
+        "<30>Oct 18 10:00:01 MikroTik dhcp,info dhcp1 assigned 192.168.88.254 to 4C:5E:0C:11:22:33",
+        "<134>Oct 18 10:00:02 MikroTik firewall,info input: in:ether1 out:(unknown 0), src-mac 00:11:22:33:44:55, proto TCP (SYN), 198.51.100.7:51234->192.168.88.1:22, len 60",
+        "<29>Oct 18 10:00:03 MikroTik system,info,account user admin logged in from 192.168.88.10 via winbox",
+        "<28>Oct 18 10:00:04 MikroTik interface,warning ether5 link down",
+    ],
+    "pfsense": [
+        "<134>Oct 18 10:00:01 filterlog[51533]: 5,,,1000000103,igb0,match,block,in,4,0x0,,64,0,0,DF,6,tcp,60,198.51.100.7,203.0.113.4,51234,22,0,S,1795385463,,64240,,mss;sackOK;TS;nop;wscale",
+        "<38>1 2025-10-18T10:00:02.123456+02:00 pfsense.home.arpa sshd 7321 - - Accepted publickey for admin from 192.168.1.10 port 50123 ssh2",
+        "<30>1 2025-10-18T10:00:03.000000+02:00 pfsense.home.arpa dhcpd 1234 - - DHCPACK on 192.168.1.50 to aa:bb:cc:dd:ee:ff (phone) via igb1",
+        "<11>1 2025-10-18T10:00:04.000000+02:00 pfsense.home.arpa php-fpm 402 - - /index.php: webConfigurator authentication error for user 'admin' from: 192.168.1.99",
+    ],
+    "ubiquiti": [
+        "<30>Oct 18 10:00:01 U7PG2,18e8294d9f0c,v6.5.62.14789: hostapd: ath0: STA aa:bb:cc:dd:ee:ff IEEE 802.11: associated",
+        "<30>Oct 18 10:00:02 U7PG2,18e8294d9f0c,v6.5.62.14789: kernel: [123456.789] wlan: [0:I:ANY] ieee80211_ioctl_kickmac: kick aa:bb:cc:dd:ee:ff",
+        "<29>Oct 18 10:00:03 USW-Lite-8-PoE,74acb9aa0011,v6.6.61.15220: switch: TRAPMGR: Link Up: 0/5",
+        "<28>Oct 18 10:00:04 UDM-Pro [LAN_LOCAL-D-2147483647] IN=br0 OUT= MAC=aa:bb SRC=192.168.1.23 DST=192.168.1.1 PROTO=UDP SPT=5353 DPT=5353",
+    ],
+    "synology": [
+        '<14>1 2025-10-18T10:00:01+02:00 NAS WinFileService - - [synolog@6574 synotype="WinFileService" ip="192.168.1.10" luser="alice" event="read" isdir="File" fsize="1.21 MB" fname="/volume1/share/report.pdf"] Event: read, Path: /volume1/share/report.pdf',
+        '<13>1 2025-10-18T10:00:02+02:00 NAS Connection - - [synolog@6574 synotype="Connection" username="alice" ip="192.168.1.10"] User [alice] from [192.168.1.10] signed in to [DSM] successfully via [password].',
+        "<12>1 2025-10-18T10:00:03+02:00 NAS System - - - Volume [1] usage has exceeded 80%.",
+        '<11>1 2025-10-18T10:00:04+02:00 NAS Connection - - [synolog@6574 synotype="Connection" username="root" ip="198.51.100.7"] User [root] from [198.51.100.7] failed to sign in to [SSH] via [password] due to authorization failure.',
+    ],
+}
@@ -0,0 +1,147 @@
+"""Syslog load generator for the end-to-end benchmarks.
+
+Senders run in their own processes so they do not compete with the receiver
+for the event loop. Each one cycles through a weighted mix of the device
+lines in corpus.py and adds how many messages it sent to a shared counter.
+
+    python benchmarks/loadgen.py udp 127.0.0.1 514 [--seconds S] [--rate N]
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import socket
+import ssl
+import subprocess
+import time
+
+from corpus import CORPUS
+
+# Share of the traffic per device family: firewalls are the loudest
+MIX = {"pfsense": 4, "mikrotik": 3, "ubiquiti": 2, "synology": 1}
+
+# Messages written to a stream socket per send call
+STREAM_BATCH = 64
+
+
+def message_mix(count: int = 1000, seed: int = 1):
+    """Return `count` encoded lines drawn from the corpus with the MIX weights."""
+    rnd = random.Random(seed)
+    families = list(MIX)
+    weights = [MIX[family] for family in families]
+    return [
+        rnd.choice(CORPUS[family]).encode()
+        for family in rnd.choices(families, weights, k=count)
+    ]
+
+
+def make_self_signed_cert(directory: str):
+    """Create a throw-away certificate and key for 127.0.0.1 with the openssl CLI."""
+    if shutil.which("openssl") is None:
+        raise RuntimeError("the openssl command is needed to generate a test certificate")
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        [
+            "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+            "-subj", "/CN=127.0.0.1", "-keyout", keyfile, "-out", certfile,
+        ],
+        check=True,
+        capture_output=True,
+    )
+    return certfile, keyfile
+
+
+class Pacer:
+    """Tells how many messages are due to keep an average rate (0 = unlimited)."""
+
+    def __init__(self, rate: float, chunk: int):
+        self.rate = rate
+        self.chunk = chunk
+        self.start = time.monotonic()
+        self.sent = 0
+
+    def due(self) -> int:
+        if not self.rate:
+            return self.chunk
+        while True:
+            due = int((time.monotonic() - self.start) * self.rate) - self.sent
+            if due > 0:
+                return min(due, self.chunk)
+            time.sleep(0.0005)
+
+
+def send_udp(host: str, port: int, seconds: float, rate: float, counter, seed: int = 1):
+    """Send datagrams for `seconds`; runs in a child process."""
+    lines = message_mix(seed=seed)
+    family = socket.AF_INET6 if ":" in host else socket.AF_INET
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    pacer = Pacer(rate, STREAM_BATCH)
+    deadline = time.monotonic() + seconds
+    i = 0
+    while time.monotonic() < deadline:
+        for _ in range(pacer.due()):
+            sock.sendto(lines[i % len(lines)], (host, port))
+            i += 1
+        pacer.sent = i
+    sock.close()
+    with counter.get_lock():
+        counter.value += i
+
+
+def send_stream(host: str, port: int, seconds: float, rate: float, counter,
+                tls: bool = False, octet_counting: bool = False, seed: int = 1):
+    """Send a TCP or TLS stream for `seconds`; runs in a child process."""
+    lines = message_mix(seed=seed)
+    if octet_counting:
+        frames = [b"%d %s" % (len(line), line) for line in lines]
+    else:
+        frames = [line + b"\n" for line in lines]
+    sock = socket.create_connection((host, port))
+    if tls:
+        context = ssl.create_default_context()
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        sock = context.wrap_socket(sock)
+    pacer = Pacer(rate, STREAM_BATCH)
+    deadline = time.monotonic() + seconds
+    i = 0
+    while time.monotonic() < deadline:
+        n = pacer.due()
+        sock.sendall(b"".join(frames[(i + k) % len(frames)] for k in range(n)))
+        i += n
+        pacer.sent = i
+    # Close cleanly: closing with unread data (TLS session tickets) would reset
+    # the connection and the receiver would lose what it has not read yet
+    if tls:
+        sock = sock.unwrap()
+    sock.shutdown(socket.SHUT_WR)
+    while sock.recv(65536):
+        pass
+    sock.close()
+    with counter.get_lock():
+        counter.value += i
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("protocol", choices=("udp", "tcp", "tls"))
+    parser.add_argument("host")
+    parser.add_argument("port", type=int)
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--rate", type=float, default=0, help="messages/s, 0 = as fast as possible")
+    parser.add_argument("--octet-counting", action="store_true")
+    args = parser.parse_args()
+
+    counter = multiprocessing.Value("q", 0)
+    if args.protocol == "udp":
+        send_udp(args.host, args.port, args.seconds, args.rate, counter)
+    else:
+        send_stream(args.host, args.port, args.seconds, args.rate, counter,
+                    tls=args.protocol == "tls", octet_counting=args.octet_counting)
+    print(f"sent {counter.value:,} messages ({counter.value / args.seconds:,.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
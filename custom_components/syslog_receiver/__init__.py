@@ -1,13 +1,25 @@
 import logging
+import shutil
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 from .const import DOMAIN
 from .server import SyslogServer
+from .services import async_setup_services
 
 _LOGGER = logging.getLogger(__name__)
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Register the integration services."""
+    async_setup_services(hass)
+    return True
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
-    server = SyslogServer(hass, entry.data, entry.options)
+    storage_dir = hass.config.path(DOMAIN, entry.entry_id)
+    server = SyslogServer(hass, entry.data, entry.options, storage_dir=storage_dir)
     try:
         await server.start()
     except Exception as err:
@@ -19,8 +31,19 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     if enable_sensors:
         await hass.config_entries.async_forward_entry_setups(entry, ["sensor"])
 
+    entry.async_on_unload(entry.add_update_listener(async_update_options))
     return True
 
+async def async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options in place, or reload the entry if the listeners change."""
+    server = hass.data[DOMAIN][entry.entry_id]
+    if server.needs_restart(entry.options):
+        _LOGGER.debug("Reloading '%s' to apply new listener options", entry.title)
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+    await server.async_update_options(entry.options)
+    _LOGGER.debug("Applied new options to '%s' without restarting its listeners", entry.title)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     server = hass.data[DOMAIN].pop(entry.entry_id)
     await server.stop()
@@ -32,6 +55,12 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
     return True
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the message archive of a removed entry."""
+    storage_dir = hass.config.path(DOMAIN, entry.entry_id)
+    await hass.async_add_executor_job(shutil.rmtree, storage_dir, True)
+    _LOGGER.debug("Removed message archive %s of '%s'", storage_dir, entry.title)
+
 async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Migrate old config entries to the latest version."""
     old_version = entry.version
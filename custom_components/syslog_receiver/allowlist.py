@@ -0,0 +1,89 @@
+import ipaddress
+import logging
+from bisect import bisect_right
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bound of remembered lookup results (one entry per distinct sender)
+CACHE_SIZE = 4096
+
+
+def parse_address(value: str):
+    """Parse an IP address string, normalizing scopes and IPv4-mapped IPv6 addresses."""
+    addr = ipaddress.ip_address(value.split("%", 1)[0])
+    if addr.version == 6 and addr.ipv4_mapped is not None:
+        return addr.ipv4_mapped
+    return addr
+
+
+def parse_allowed_ips(raw: str):
+    """Split a comma-separated allow-list into networks and a list of invalid entries."""
+    networks = []
+    invalid = []
+    for item in (raw or "").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            net = ipaddress.ip_network(item.split("%", 1)[0], strict=False)
+        except ValueError:
+            invalid.append(item)
+            continue
+        if net.version == 6 and net.network_address.ipv4_mapped is not None and net.prefixlen >= 96:
+            # ::ffff:10.0.0.0/104 is the same range as 10.0.0.0/8
+            net = ipaddress.ip_network(f"{net.network_address.ipv4_mapped}/{net.prefixlen - 96}")
+        networks.append(net)
+    return networks, invalid
+
+
+class AllowList:
+    """Source address matcher for the allowed_ips option.
+
+    Accepts single hosts and CIDR ranges for both IPv4 and IPv6. The ranges of
+    each address family are merged into sorted, disjoint integer intervals, so
+    a lookup is a binary search regardless of how many subnets are listed.
+    Results are cached per source string, since a receiver normally hears
+    from a small set of senders.
+    """
+
+    __slots__ = ("_starts", "_ends", "_cache", "_empty")
+
+    def __init__(self, raw: str = ""):
+        networks, invalid = parse_allowed_ips(raw)
+        for item in invalid:
+            _LOGGER.warning("Ignoring invalid entry '%s' in allowed IPs", item)
+
+        self._starts = {4: [], 6: []}
+        self._ends = {4: [], 6: []}
+        for version in (4, 6):
+            nets = [net for net in networks if net.version == version]
+            for net in ipaddress.collapse_addresses(nets):
+                self._starts[version].append(int(net.network_address))
+                self._ends[version].append(int(net.broadcast_address))
+        # Invalid entries still count: a mistyped list must not open the filter
+        self._empty = not networks and not invalid
+        self._cache = {}
+
+    def __bool__(self) -> bool:
+        return not self._empty
+
+    def __contains__(self, src_ip: str) -> bool:
+        if self._empty:
+            return True
+        try:
+            return self._cache[src_ip]
+        except KeyError:
+            pass
+        try:
+            addr = parse_address(src_ip)
+        except ValueError:
+            allowed = False
+        else:
+            value = int(addr)
+            starts = self._starts[addr.version]
+            i = bisect_right(starts, value) - 1
+            allowed = i >= 0 and value <= self._ends[addr.version][i]
+        if len(self._cache) >= CACHE_SIZE:
+            self._cache.clear()
+        self._cache[src_ip] = allowed
+        return allowed
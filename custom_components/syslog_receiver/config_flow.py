@@ -2,6 +2,9 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.helpers import config_validation as cv
+from .allowlist import parse_allowed_ips
+from .listeners import parse_listeners, valid_forward_target
+from .rules import parse_rules
 from .const import (
     DOMAIN,
     DEFAULT_HOST,
@@ -16,6 +19,42 @@ from .const import (
     MIN_SEVERITY_LEVELS,
     DEFAULT_ENCODING,
     COMMON_ENCODINGS,
+    DEFAULT_BATCH_EVENTS,
+    DEFAULT_BATCH_INTERVAL,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_OVERFLOW_POLICY,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_BURST,
+    OVERFLOW_POLICIES,
+    DEFAULT_SENSOR_UPDATE_INTERVAL,
+    DEFAULT_MAX_FRAME_SIZE,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_UDP_SOCKETS,
+    DEFAULT_UDP_RCVBUF,
+    DEFAULT_WORKER_MODE,
+    DEFAULT_WORKER_COUNT,
+    WORKER_MODES,
+    DEFAULT_ARCHIVE,
+    DEFAULT_ARCHIVE_SIZE,
+    DEFAULT_LISTENERS,
+    DEFAULT_RULES,
+    DEFAULT_DEDUP_WINDOW,
+    DEFAULT_DEDUP_SIZE,
+    DEFAULT_UDP_ENGINE,
+    UDP_ENGINES,
+    DEFAULT_MAX_CONNECTIONS_PER_SOURCE,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_MAX_TLS_HANDSHAKES,
+    DEFAULT_FORWARD_TARGET,
+    DEFAULT_FORWARD_SCOPE,
+    FORWARD_SCOPES,
+    DEFAULT_FORWARD_QUEUE_SIZE,
+    DEFAULT_FORWARD_FILE_SIZE,
+    DEFAULT_THROTTLE_RATE,
+    DEFAULT_THROTTLE_LAG,
+    DEFAULT_THROTTLE_KEEP_SEVERITY,
 )
 
 STEP_USER_DATA_SCHEMA = vol.Schema(
@@ -24,13 +63,45 @@ STEP_USER_DATA_SCHEMA = vol.Schema(
         vol.Required("host", default=DEFAULT_HOST): str,
         vol.Required("port", default=DEFAULT_PORT): int,
         vol.Required("protocol", default=DEFAULT_PROTOCOL): vol.In(("UDP", "TCP")),
+        vol.Optional("listeners", default=DEFAULT_LISTENERS): str,
+        vol.Optional("udp_sockets", default=DEFAULT_UDP_SOCKETS): vol.All(int, vol.Range(min=1, max=64)),
+        vol.Optional("udp_rcvbuf", default=DEFAULT_UDP_RCVBUF): vol.All(int, vol.Range(min=0)),
+        vol.Optional("udp_engine", default=DEFAULT_UDP_ENGINE): vol.In(UDP_ENGINES),
         vol.Required("use_tls", default=DEFAULT_USE_TLS): bool,
+        vol.Optional("max_frame_size", default=DEFAULT_MAX_FRAME_SIZE): vol.All(int, vol.Range(min=480)),
+        vol.Optional("max_connections", default=DEFAULT_MAX_CONNECTIONS): vol.All(int, vol.Range(min=0)),
+        vol.Optional("max_connections_per_source", default=DEFAULT_MAX_CONNECTIONS_PER_SOURCE): vol.All(int, vol.Range(min=0)),
+        vol.Optional("idle_timeout", default=DEFAULT_IDLE_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("read_timeout", default=DEFAULT_READ_TIMEOUT): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("max_tls_handshakes", default=DEFAULT_MAX_TLS_HANDSHAKES): vol.All(int, vol.Range(min=0)),
         vol.Optional("certfile", default=DEFAULT_CERTFILE): cv.string,
         vol.Optional("keyfile", default=DEFAULT_KEYFILE): cv.string,
         vol.Required("allowed_ips", default=DEFAULT_ALLOWED_IPS): str,
         vol.Required("min_severity", default=DEFAULT_MIN_SEVERITY): vol.In(tuple(MIN_SEVERITY_LEVELS.keys())),
+        vol.Optional("rules", default=DEFAULT_RULES): str,
+        vol.Optional("throttle_rate", default=DEFAULT_THROTTLE_RATE): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("throttle_lag", default=DEFAULT_THROTTLE_LAG): vol.All(int, vol.Range(min=0)),
+        vol.Optional("throttle_keep_severity", default=DEFAULT_THROTTLE_KEEP_SEVERITY): vol.In(tuple(MIN_SEVERITY_LEVELS.keys())),
         vol.Required("enable_sensors", default=False): bool,
+        vol.Optional("sensor_update_interval", default=DEFAULT_SENSOR_UPDATE_INTERVAL): vol.All(vol.Coerce(float), vol.Range(min=0)),
         vol.Optional("encoding", default=DEFAULT_ENCODING): vol.In(COMMON_ENCODINGS),
+        vol.Optional("archive", default=DEFAULT_ARCHIVE): bool,
+        vol.Optional("archive_size", default=DEFAULT_ARCHIVE_SIZE): vol.All(int, vol.Range(min=1)),
+        vol.Optional("worker_mode", default=DEFAULT_WORKER_MODE): vol.In(WORKER_MODES),
+        vol.Optional("worker_count", default=DEFAULT_WORKER_COUNT): vol.All(int, vol.Range(min=1, max=16)),
+        vol.Optional("batch_events", default=DEFAULT_BATCH_EVENTS): bool,
+        vol.Optional("batch_interval", default=DEFAULT_BATCH_INTERVAL): vol.All(int, vol.Range(min=10)),
+        vol.Optional("batch_size", default=DEFAULT_BATCH_SIZE): vol.All(int, vol.Range(min=1)),
+        vol.Optional("queue_size", default=DEFAULT_QUEUE_SIZE): vol.All(int, vol.Range(min=1)),
+        vol.Optional("overflow_policy", default=DEFAULT_OVERFLOW_POLICY): vol.In(OVERFLOW_POLICIES),
+        vol.Optional("rate_limit", default=DEFAULT_RATE_LIMIT): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("rate_burst", default=DEFAULT_RATE_BURST): vol.All(int, vol.Range(min=1)),
+        vol.Optional("dedup_window", default=DEFAULT_DEDUP_WINDOW): vol.All(vol.Coerce(float), vol.Range(min=0)),
+        vol.Optional("dedup_size", default=DEFAULT_DEDUP_SIZE): vol.All(int, vol.Range(min=1)),
+        vol.Optional("forward_target", default=DEFAULT_FORWARD_TARGET): str,
+        vol.Optional("forward_scope", default=DEFAULT_FORWARD_SCOPE): vol.In(FORWARD_SCOPES),
+        vol.Optional("forward_queue_size", default=DEFAULT_FORWARD_QUEUE_SIZE): vol.All(int, vol.Range(min=1)),
+        vol.Optional("forward_file_size", default=DEFAULT_FORWARD_FILE_SIZE): vol.All(int, vol.Range(min=1)),
     }
 )
 
@@ -44,13 +115,23 @@ class SyslogConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(self, user_input=None):
         errors = {}
         if user_input is not None:
-            if user_input.get("encoding") == "Other…":
+            _, invalid = parse_allowed_ips(user_input.get("allowed_ips", ""))
+            if invalid:
+                errors["allowed_ips"] = "invalid_allowed_ips"
+            elif parse_listeners(user_input.get("listeners", ""))[1]:
+                errors["listeners"] = "invalid_listeners"
+            elif parse_rules(user_input.get("rules", ""))[1]:
+                errors["rules"] = "invalid_rules"
+            elif not valid_forward_target(user_input.get("forward_target", "")):
+                errors["forward_target"] = "invalid_forward_target"
+            elif user_input.get("encoding") == "Other…":
                 self._temp_user_input = user_input  # stash for next step
                 return await self.async_step_custom_encoding()
-            return self.async_create_entry(
-                title=user_input["instance_name"],
-                data=user_input
-            )
+            else:
+                return self.async_create_entry(
+                    title=user_input["instance_name"],
+                    data=user_input
+                )
         return self.async_show_form(
             step_id="user",
             data_schema=STEP_USER_DATA_SCHEMA,
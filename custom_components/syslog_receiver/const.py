@@ -28,4 +28,67 @@ COMMON_ENCODINGS = [
     "gbk",
     "big5",
     "Other…"
-]
\ No newline at end of file
+]
+EVENT_MESSAGE = f"{DOMAIN}_message"
+EVENT_BATCH = f"{DOMAIN}_batch"
+
+# Batched event dispatch and per-source rate limiting
+DEFAULT_BATCH_EVENTS = False
+DEFAULT_BATCH_INTERVAL = 1000  # ms
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_QUEUE_SIZE = 5000
+DEFAULT_OVERFLOW_POLICY = "drop_oldest"
+OVERFLOW_POLICIES = ["drop_oldest", "drop_newest", "sample"]
+DEFAULT_RATE_LIMIT = 0  # messages per second per source, 0 = unlimited
+DEFAULT_RATE_BURST = 100
+
+# Minimum seconds between two sensor state writes, 0 = write on every message
+DEFAULT_SENSOR_UPDATE_INTERVAL = 0
+
+# TCP framing and connection limits
+DEFAULT_MAX_FRAME_SIZE = 65536  # bytes
+DEFAULT_MAX_CONNECTIONS = 100  # 0 = unlimited
+DEFAULT_MAX_CONNECTIONS_PER_SOURCE = 0  # 0 = unlimited
+DEFAULT_IDLE_TIMEOUT = 0  # seconds without data before a session is closed, 0 = never
+DEFAULT_READ_TIMEOUT = 60  # seconds to finish a started message or a TLS handshake, 0 = never
+DEFAULT_MAX_TLS_HANDSHAKES = 10  # concurrent TLS handshakes, 0 = unlimited
+
+# UDP fan-out over several SO_REUSEPORT sockets and their receive buffer
+DEFAULT_UDP_SOCKETS = 1
+DEFAULT_UDP_RCVBUF = 0  # bytes, 0 = system default
+
+# Off-loop decoding and parsing
+DEFAULT_WORKER_MODE = "off"
+WORKER_MODES = ["off", "process"]
+DEFAULT_WORKER_COUNT = 2
+
+# On-disk message archive
+DEFAULT_ARCHIVE = False
+DEFAULT_ARCHIVE_SIZE = 64  # MB
+SERVICE_QUERY = "query"
+
+# Listeners as "udp://host:port, tcp://host:port, tls://host:port"; empty uses host/port/protocol
+DEFAULT_LISTENERS = ""
+
+# Routing rules, "conditions -> action" separated by ";" (see rules.py)
+DEFAULT_RULES = ""
+
+# Duplicate suppression: window in seconds (0 = off) and most distinct messages tracked
+DEFAULT_DEDUP_WINDOW = 0
+DEFAULT_DEDUP_SIZE = 10000
+
+# UDP receive engine: asyncio datagram protocol, or batched reads into a reusable buffer
+DEFAULT_UDP_ENGINE = "protocol"
+UDP_ENGINES = ["protocol", "batch"]
+
+# Forwarding to an upstream syslog server or a rotating file; target "" = off
+DEFAULT_FORWARD_TARGET = ""
+DEFAULT_FORWARD_SCOPE = "accepted"
+FORWARD_SCOPES = ["accepted", "all"]
+DEFAULT_FORWARD_QUEUE_SIZE = 10000
+DEFAULT_FORWARD_FILE_SIZE = 10  # MB
+
+# Adaptive throttling under overload: budgets (0 = off) and the severities never throttled
+DEFAULT_THROTTLE_RATE = 0  # messages per second let through
+DEFAULT_THROTTLE_LAG = 0  # ms of event loop lag
+DEFAULT_THROTTLE_KEEP_SEVERITY = "err"
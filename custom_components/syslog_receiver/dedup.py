@@ -0,0 +1,95 @@
+from collections import OrderedDict
+
+
+class _Entry:
+    __slots__ = ("expires", "count", "event_type", "event_data")
+
+    def __init__(self, expires: float, event_type: str):
+        self.expires = expires
+        self.count = 0
+        self.event_type = event_type
+        self.event_data = None
+
+
+class Deduplicator:
+    """Collapse identical messages into one "repeated N times" event per window.
+
+    A message is identified by its source, severity, app name and body; the
+    body is the text after the syslog header, so the timestamps of the copies
+    do not matter, and runs of whitespace are collapsed. The first message of
+    a key is passed on at once and opens a window of `window` seconds. Copies
+    arriving within that window are only counted; when it closes, the last
+    copy is emitted once with a `repeat_count` field holding the number of
+    copies it stands for. The next copy after that opens a new window.
+
+    Windows have a fixed length, so insertion order is also expiry order:
+    expired keys are popped from the front of the table by one timer, and when
+    the table holds `max_entries` keys the oldest one is evicted (and its
+    repeats emitted) early. Memory stays bounded under a flood of unique lines.
+    """
+
+    def __init__(self, loop, window: float, max_entries: int, emit):
+        self.loop = loop
+        self.window = window
+        self.max_entries = max(max_entries, 1)
+        self.emit = emit          # emit(event_type, event_data) for repeat summaries
+        self._table = OrderedDict()
+        self._timer = None
+        self.suppressed = 0
+
+    @staticmethod
+    def key(event_data: dict):
+        body = event_data.get("body")
+        if body is None:
+            body = event_data["message"]
+        return (
+            event_data["source_ip"],
+            event_data["severity"],
+            event_data.get("app_name"),
+            " ".join(body.split()),
+        )
+
+    def seen(self, event_type: str, event_data: dict) -> bool:
+        """Return True if the message repeats one of the current window and was absorbed."""
+        key = self.key(event_data)
+        table = self._table
+        entry = table.get(key)
+        if entry is not None:
+            entry.count += 1
+            entry.event_data = event_data
+            self.suppressed += 1
+            return True
+
+        if len(table) >= self.max_entries:
+            self._release(*table.popitem(last=False))
+        table[key] = _Entry(self.loop.time() + self.window, event_type)
+        if self._timer is None:
+            self._timer = self.loop.call_later(self.window, self._expire)
+        return False
+
+    def _release(self, key, entry: _Entry):
+        if entry.count:
+            event_data = dict(entry.event_data)
+            event_data["repeat_count"] = entry.count
+            self.emit(entry.event_type, event_data)
+
+    def _expire(self):
+        self._timer = None
+        table = self._table
+        now = self.loop.time()
+        while table:
+            key, entry = next(iter(table.items()))
+            if entry.expires > now:
+                self._timer = self.loop.call_later(entry.expires - now, self._expire)
+                return
+            del table[key]
+            self._release(key, entry)
+
+    def close(self):
+        """Emit the repeats still held and clear the table."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        table = self._table
+        while table:
+            self._release(*table.popitem(last=False))
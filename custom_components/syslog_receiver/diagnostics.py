@@ -0,0 +1,16 @@
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from .const import DOMAIN
+
+TO_REDACT = {"certfile", "keyfile"}
+
+
+async def async_get_config_entry_diagnostics(hass: HomeAssistant, entry: ConfigEntry) -> dict:
+    """Return configuration and receiver counters for a config entry."""
+    server = hass.data.get(DOMAIN, {}).get(entry.entry_id)
+    return {
+        "config": async_redact_data(dict(entry.data), TO_REDACT),
+        "options": async_redact_data(dict(entry.options), TO_REDACT),
+        "stats": await hass.async_add_executor_job(server.get_stats) if server else None,
+    }
@@ -0,0 +1,137 @@
+import logging
+import random
+import time
+from collections import deque
+from .const import EVENT_BATCH
+
+_LOGGER = logging.getLogger(__name__)
+
+# Upper bound of tracked sources in the rate limiter
+MAX_BUCKETS = 4096
+
+
+class RateLimiter:
+    """Per-source token bucket: `rate` messages per second with bursts of `burst`."""
+
+    __slots__ = ("rate", "burst", "_buckets", "dropped")
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = float(rate)
+        self.burst = float(max(burst, 1))
+        self._buckets = {}
+        self.dropped = 0
+
+    def allow(self, src_ip: str) -> bool:
+        """Take a token for src_ip; return False if its bucket is empty."""
+        now = time.monotonic()
+        bucket = self._buckets.get(src_ip)
+        if bucket is None:
+            if len(self._buckets) >= MAX_BUCKETS:
+                self._evict(now)
+            self._buckets[src_ip] = [self.burst - 1, now]
+            return True
+        tokens = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+        bucket[1] = now
+        if tokens < 1:
+            bucket[0] = tokens
+            self.dropped += 1
+            return False
+        bucket[0] = tokens - 1
+        return True
+
+    def _evict(self, now: float):
+        """Forget sources whose bucket has refilled; they behave like new sources."""
+        full = [src for src, (tokens, last) in self._buckets.items()
+                if tokens + (now - last) * self.rate >= self.burst]
+        for src in full:
+            del self._buckets[src]
+        if len(self._buckets) >= MAX_BUCKETS:
+            self._buckets.clear()
+
+
+class BatchDispatcher:
+    """Collect messages in a bounded queue and fire them as `syslog_receiver_batch` events.
+
+    Once `batch_size` messages are pending, every full batch is fired at the
+    end of the current event loop iteration; a partial batch waits at most one
+    interval. Each flush fires one event with up to `batch_size` messages.
+    When more than `queue_size` messages arrive within one loop iteration, the
+    overflow policy decides what is shed:
+
+    - drop_oldest: the oldest queued message is discarded
+    - drop_newest: the incoming message is discarded
+    - sample: the queue keeps a uniform random sample of everything received
+      since the last flush (reservoir sampling)
+    """
+
+    def __init__(self, hass, interval_ms: int, batch_size: int, queue_size: int, overflow: str):
+        self.hass = hass
+        self.interval = max(interval_ms, 1) / 1000
+        self.batch_size = max(batch_size, 1)
+        self.queue_size = max(queue_size, self.batch_size)
+        self.overflow = overflow
+        self._queue = deque()
+        self._seen = 0  # messages offered since the last flush, for sampling
+        self._timer = None
+        self._full_scheduled = False
+        self.dropped = 0
+        self.batches = 0
+
+    def add(self, event_data: dict):
+        """Queue a message for the next batch, applying the overflow policy."""
+        queue = self._queue
+        self._seen += 1
+        if len(queue) >= self.queue_size:
+            self.dropped += 1
+            if self.overflow == "drop_newest":
+                return
+            if self.overflow == "sample":
+                slot = random.randrange(self._seen)
+                if slot < len(queue):
+                    queue[slot] = event_data
+                return
+            queue.popleft()
+        queue.append(event_data)
+
+        if len(queue) >= self.batch_size:
+            if not self._full_scheduled:
+                # Fire after the messages of this loop iteration are queued, not one by one
+                self._full_scheduled = True
+                self.hass.loop.call_soon(self._flush_full)
+        elif self._timer is None:
+            self._timer = self.hass.loop.call_later(self.interval, self._on_timer)
+
+    def _flush_full(self):
+        self._full_scheduled = False
+        while len(self._queue) >= self.batch_size:
+            self.flush()
+
+    def _on_timer(self):
+        self._timer = None
+        self.flush()
+
+    def flush(self):
+        """Fire one batch event with up to batch_size queued messages."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        queue = self._queue
+        if queue:
+            count = min(len(queue), self.batch_size)
+            messages = [queue.popleft() for _ in range(count)]
+            self.hass.bus.async_fire(
+                EVENT_BATCH,
+                {"messages": messages, "count": count, "pending": len(queue), "dropped": self.dropped},
+            )
+            self.batches += 1
+        self._seen = len(queue)
+        if queue:
+            self._timer = self.hass.loop.call_later(self.interval, self._on_timer)
+
+    def close(self):
+        """Flush everything still queued and stop the timer."""
+        while self._queue:
+            self.flush()
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
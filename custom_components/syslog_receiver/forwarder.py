@@ -0,0 +1,292 @@
+import asyncio
+import logging
+import os
+import ssl
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+
+from .listeners import parse_forward_target
+
+_LOGGER = logging.getLogger(__name__)
+
+# Messages taken from the queue per write
+FORWARD_BATCH = 256
+
+# Reconnect delay, doubled after every failed attempt up to the maximum (seconds)
+RECONNECT_MIN = 1.0
+RECONNECT_MAX = 60.0
+
+# Give up on a connection attempt, or on an upstream that stopped reading, after this long
+CONNECT_TIMEOUT = 10.0
+WRITE_TIMEOUT = 30.0
+
+# Rotated copies of the forward file kept next to it (.1 is the newest)
+FILE_BACKUPS = 5
+
+
+def syslog_line(event_data: dict) -> bytes:
+    """Rebuild the syslog line of an accepted message: its <PRI> header and the message."""
+    facility = event_data["facility"]
+    severity = event_data["severity"]
+    message = event_data["message"].encode("utf-8", "replace")
+    if facility is None or severity is None:
+        return message
+    return b"<%d>%s" % (facility * 8 + severity, message)
+
+
+class Forwarder(ABC):
+    """Relay messages to an upstream target without ever blocking the receive path.
+
+    add() runs on the event loop and only appends to a bounded queue; when it
+    is full the oldest message is discarded and counted in `dropped`. One
+    sender task drains the queue in batches of up to FORWARD_BATCH messages.
+    When the target cannot be reached, or a write fails, the sender closes it
+    and reconnects after a delay that doubles from RECONNECT_MIN up to
+    RECONNECT_MAX, and only goes back to RECONNECT_MIN once a batch has been
+    written; meanwhile messages wait in the queue. A batch that failed to be
+    written is counted as dropped. Unexpected errors are logged and handled
+    the same way, so the sender never stops while add() keeps queueing.
+
+    Subclasses implement _open(), _send(lines) and _close() for one kind of target.
+    """
+
+    def __init__(self, hass, target: str, queue_size: int):
+        self.hass = hass
+        self.target = target
+        self.queue_size = max(queue_size, 1)
+        self._queue = deque()
+        self._wakeup = asyncio.Event()
+        self._task = None
+        self._delay = RECONNECT_MIN
+        self.connected = False
+        self.forwarded = 0
+        self.dropped = 0
+        self.errors = 0   # failed connection attempts and writes
+
+    @property
+    def pending(self) -> int:
+        return len(self._queue)
+
+    def start(self):
+        """Start the sender task."""
+        self._task = self.hass.loop.create_task(self._run())
+
+    def add(self, line: bytes):
+        """Queue one message, shedding the oldest if the queue is full."""
+        queue = self._queue
+        if len(queue) >= self.queue_size:
+            queue.popleft()
+            self.dropped += 1
+        queue.append(line)
+        if not self._wakeup.is_set():
+            self._wakeup.set()
+
+    def add_event(self, event_data: dict):
+        """Queue an accepted message as its syslog line."""
+        self.add(syslog_line(event_data))
+
+    async def _run(self):
+        while True:
+            try:
+                await self._open()
+            except (OSError, ssl.SSLError, asyncio.TimeoutError) as ex:
+                self.errors += 1
+                log = _LOGGER.warning if self._delay == RECONNECT_MIN else _LOGGER.debug
+                log("Cannot forward to %s, retrying in %.0f s: %s", self.target, self._delay, str(ex) or "timeout")
+            except Exception:
+                self.errors += 1
+                _LOGGER.exception("Cannot forward to %s, retrying in %.0f s", self.target, self._delay)
+            else:
+                self.connected = True
+                try:
+                    await self._pump()
+                except (OSError, ssl.SSLError, asyncio.TimeoutError) as ex:
+                    self.errors += 1
+                    log = _LOGGER.warning if self._delay == RECONNECT_MIN else _LOGGER.debug
+                    log("Forwarding to %s failed, reconnecting in %.0f s: %s", self.target, self._delay, str(ex) or "timeout")
+                except Exception:
+                    self.errors += 1
+                    _LOGGER.exception("Forwarding to %s failed, reconnecting in %.0f s", self.target, self._delay)
+                finally:
+                    self.connected = False
+                    try:
+                        await self._close()
+                    except Exception:
+                        _LOGGER.exception("Error closing forward target %s", self.target)
+            # Wait after failed writes too, so an upstream that accepts and then resets does not spin
+            await asyncio.sleep(self._delay)
+            self._delay = min(self._delay * 2, RECONNECT_MAX)
+
+    async def _pump(self):
+        queue = self._queue
+        while True:
+            if not queue:
+                self._wakeup.clear()
+                await self._wakeup.wait()
+            lines = [queue.popleft() for _ in range(min(len(queue), FORWARD_BATCH))]
+            try:
+                await self._send(lines)
+            except Exception:
+                self.dropped += len(lines)
+                raise
+            self.forwarded += len(lines)
+            if self._delay != RECONNECT_MIN:
+                # The target takes messages again: start over from the shortest delay
+                _LOGGER.info("Forwarding to %s again", self.target)
+                self._delay = RECONNECT_MIN
+
+    @abstractmethod
+    async def _open(self):
+        """Connect to or open the target."""
+
+    @abstractmethod
+    async def _send(self, lines):
+        """Write a batch of messages."""
+
+    @abstractmethod
+    async def _close(self):
+        """Close the target."""
+
+    async def async_close(self):
+        """Stop the sender and close the target; messages still queued are discarded."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.wait([self._task])
+            self._task = None
+        self._queue.clear()
+
+
+class UDPForwarder(Forwarder):
+    """One datagram per message, as RFC 5426 relays do."""
+
+    def __init__(self, hass, target: str, queue_size: int, host: str, port: int):
+        super().__init__(hass, target, queue_size)
+        self.address = (host, port)
+        self._transport = None
+
+    async def _open(self):
+        # The loop resolves the address without blocking
+        self._transport, _ = await self.hass.loop.create_datagram_endpoint(
+            asyncio.DatagramProtocol, remote_addr=self.address
+        )
+
+    async def _send(self, lines):
+        sendto = self._transport.sendto
+        for line in lines:
+            sendto(line)
+        # Let the receive path run between batches
+        await asyncio.sleep(0)
+
+    async def _close(self):
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+
+
+class StreamForwarder(Forwarder):
+    """Octet-counted messages over one TCP or TLS connection (RFC 6587 section 3.4.1).
+
+    Every message is sent as "LENGTH MESSAGE", so line breaks inside a message
+    cannot split it in two upstream.
+    """
+
+    def __init__(self, hass, target: str, queue_size: int, host: str, port: int, tls: bool):
+        super().__init__(hass, target, queue_size)
+        self.host = host
+        self.port = port
+        self.tls = tls
+        self._ssl_context = None
+        self._writer = None
+
+    async def _open(self):
+        if self.tls and self._ssl_context is None:
+            # Loading the system CA certificates reads files: keep it off the loop
+            self._ssl_context = await self.hass.async_add_executor_job(ssl.create_default_context)
+        _, self._writer = await asyncio.wait_for(
+            asyncio.open_connection(self.host, self.port, ssl=self._ssl_context), CONNECT_TIMEOUT
+        )
+
+    async def _send(self, lines):
+        writer = self._writer
+        writer.write(b"".join([b"%d %s" % (len(line), line) for line in lines]))
+        # A slow upstream holds up this task only; the queue in front of it sheds
+        await asyncio.wait_for(writer.drain(), WRITE_TIMEOUT)
+
+    async def _close(self):
+        writer = self._writer
+        self._writer = None
+        if writer is not None:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except (OSError, ssl.SSLError):
+                pass
+
+
+class FileForwarder(Forwarder):
+    """Append messages to a local file, rotated at `max_bytes` with FILE_BACKUPS copies kept.
+
+    One message per line: line breaks inside a message are written as "\\n".
+    """
+
+    def __init__(self, hass, target: str, queue_size: int, path: str, max_bytes: int):
+        super().__init__(hass, target, queue_size)
+        self.path = path
+        self.max_bytes = max(max_bytes, 1024)
+        self._lock = threading.Lock()
+        self._file = None
+        self._size = 0
+
+    async def _open(self):
+        await self.hass.async_add_executor_job(self._open_file)
+
+    async def _send(self, lines):
+        await self.hass.async_add_executor_job(self._write, lines)
+
+    async def _close(self):
+        await self.hass.async_add_executor_job(self._close_file)
+
+    # --- executor side -------------------------------------------------
+
+    def _open_file(self):
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self._file = open(self.path, "ab")
+            self._size = self._file.tell()
+
+    def _write(self, lines):
+        data = b"\n".join([line.replace(b"\n", b"\\n") for line in lines]) + b"\n"
+        with self._lock:
+            if self._size and self._size + len(data) > self.max_bytes:
+                self._rotate()
+            self._file.write(data)
+            self._file.flush()
+            self._size += len(data)
+
+    def _rotate(self):
+        self._file.close()
+        for number in range(FILE_BACKUPS - 1, 0, -1):
+            source = f"{self.path}.{number}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{number + 1}")
+        os.replace(self.path, f"{self.path}.1")
+        self._file = open(self.path, "ab")
+        self._size = 0
+
+    def _close_file(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def create_forwarder(hass, raw_target: str, queue_size: int, file_size: int) -> Forwarder:
+    """Build the forwarder for a target URL (see parse_forward_target). Raises ValueError."""
+    scheme, host, port = parse_forward_target(raw_target)
+    target = raw_target.strip()
+    if scheme == "file":
+        return FileForwarder(hass, target, queue_size, host, file_size)
+    if scheme == "udp":
+        return UDPForwarder(hass, target, queue_size, host, port)
+    return StreamForwarder(hass, target, queue_size, host, port, scheme == "tls")
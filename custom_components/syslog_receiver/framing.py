@@ -0,0 +1,118 @@
+import logging
+
+_LOGGER = logging.getLogger(__name__)
+
+# Longest MSG-LEN prefix accepted in octet-counted framing ("99999999 ")
+_MAX_LEN_DIGITS = 9
+
+
+class FrameDecoder:
+    """Split a TCP byte stream into syslog frames (RFC 6587).
+
+    Each frame is detected on its own: a frame starting with a digit uses
+    octet counting ("MSG-LEN SP SYSLOG-MSG"), anything else is terminated by a
+    newline (non-transparent framing). This is how rsyslog and syslog-ng mix
+    both on one port.
+
+    Received chunks are appended to one reusable buffer and frames are handed
+    out as memoryview slices of it, so no per-frame copy is made. A slice is
+    only valid until the consumer asks for the next frame.
+
+    Frames longer than max_frame are truncated to max_frame bytes and the rest
+    is discarded, so a client can never make the buffer grow beyond roughly
+    max_frame plus one read chunk.
+    """
+
+    def __init__(self, max_frame: int):
+        self.max_frame = max_frame
+        self._buf = bytearray()
+        self._skip = 0          # bytes still to discard from an oversized octet-counted frame
+        self._discard_line = False  # discarding the tail of an oversized newline frame
+        self.truncated = 0
+
+    @property
+    def pending(self) -> bool:
+        """True while a frame has been started but not completed."""
+        return bool(self._buf) or bool(self._skip) or self._discard_line
+
+    def feed(self, chunk: bytes):
+        """Append a received chunk and yield every complete frame in the buffer."""
+        if self._skip:
+            if len(chunk) <= self._skip:
+                self._skip -= len(chunk)
+                return
+            chunk = chunk[self._skip:]
+            self._skip = 0
+        buf = self._buf
+        buf += chunk
+        view = memoryview(buf)
+        pos = 0
+        try:
+            while (span := self._next_frame(buf, pos)) is not None:
+                start, stop, pos = span
+                if stop > start:
+                    frame = view[start:stop]
+                    try:
+                        yield frame
+                    finally:
+                        frame.release()
+        finally:
+            view.release()
+            del buf[:pos]
+
+    def _next_frame(self, buf, pos):
+        """Locate the next frame at pos as (start, stop, next_pos), or None if incomplete."""
+        if pos >= len(buf):
+            return None
+        if self._discard_line:
+            end = buf.find(b"\n", pos)
+            if end < 0:
+                return pos, pos, len(buf)
+            self._discard_line = False
+            return pos, pos, end + 1
+
+        if 0x30 <= buf[pos] <= 0x39:
+            # Octet counting: "MSG-LEN SP SYSLOG-MSG"
+            space = buf.find(b" ", pos, pos + _MAX_LEN_DIGITS + 1)
+            if space < 0 and len(buf) - pos <= _MAX_LEN_DIGITS:
+                return None
+            length = int(buf[pos:space]) if space > pos and buf[pos:space].isdigit() else -1
+            if length >= 0:
+                start = space + 1
+                end = start + length
+                if length > self.max_frame:
+                    if end > len(buf):
+                        if len(buf) - start < self.max_frame:
+                            return None
+                        # Keep what fits, drop the remainder as it arrives
+                        self._skip = end - len(buf)
+                        end = len(buf)
+                    self.truncated += 1
+                    return start, start + self.max_frame, end
+                if end > len(buf):
+                    return None
+                return start, end, end
+            # Not a length prefix after all: fall through to newline framing
+
+        end = buf.find(b"\n", pos, pos + self.max_frame + 1)
+        if end < 0:
+            if len(buf) - pos <= self.max_frame:
+                return None
+            # Oversized line: emit the first max_frame bytes, drop the rest of the line
+            self.truncated += 1
+            self._discard_line = True
+            return pos, pos + self.max_frame, pos + self.max_frame
+        stop = end - 1 if end > pos and buf[end - 1] == 0x0D else end
+        return pos, stop, end + 1
+
+    def flush(self):
+        """Yield a trailing unterminated frame once the peer has closed the stream."""
+        buf = self._buf
+        if buf and not self._discard_line and not self._skip:
+            # An incomplete octet-counted frame is dropped, a newline frame is kept
+            space = buf.find(b" ", 0, _MAX_LEN_DIGITS + 1)
+            if not (space > 0 and buf[:space].isdigit()):
+                frame = bytes(buf[:self.max_frame]).rstrip(b"\r")
+                if frame:
+                    yield frame
+        buf.clear()
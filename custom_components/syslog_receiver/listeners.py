@@ -0,0 +1,92 @@
+import os
+from typing import NamedTuple
+
+# Listener URL schemes; "tls" is TCP with the entry's certificate
+LISTENER_SCHEMES = ("udp", "tcp", "tls")
+
+
+class Listener(NamedTuple):
+    """One socket address a receiver binds to."""
+
+    scheme: str
+    host: str
+    port: int
+
+    def __str__(self) -> str:
+        host = f"[{self.host}]" if ":" in self.host else self.host
+        return f"{self.scheme}://{host}:{self.port}"
+
+
+def parse_listener(item: str) -> Listener:
+    """Parse one "scheme://host:port" listener URL. IPv6 hosts go in brackets."""
+    scheme, sep, rest = item.strip().partition("://")
+    scheme = scheme.lower()
+    if not sep or scheme not in LISTENER_SCHEMES:
+        raise ValueError(f"Unsupported listener scheme in '{item}'")
+    host, sep, port = rest.rpartition(":")
+    if not sep or not port.isdigit() or not 0 < int(port) < 65536:
+        raise ValueError(f"Missing or invalid port in '{item}'")
+    if host.startswith("[") and host.endswith("]"):
+        host = host[1:-1]
+    elif ":" in host:
+        raise ValueError(f"IPv6 address must be in brackets in '{item}'")
+    return Listener(scheme, host, int(port))
+
+
+def parse_listeners(raw: str):
+    """Split a comma or newline separated listener list into listeners and invalid entries."""
+    listeners = []
+    invalid = []
+    for item in (raw or "").replace("\n", ",").split(","):
+        item = item.strip()
+        if not item:
+            continue
+        try:
+            listener = parse_listener(item)
+        except ValueError:
+            invalid.append(item)
+            continue
+        if listener not in listeners:
+            listeners.append(listener)
+    return listeners, invalid
+
+
+def legacy_listener(protocol: str, host: str, port: int, use_tls: bool) -> Listener:
+    """The single listener described by the host/port/protocol/use_tls options."""
+    protocol = (protocol or "").lower()
+    if protocol == "udp":
+        return Listener("udp", host or "", int(port))
+    if protocol == "tcp+tls" or (protocol == "tcp" and use_tls):
+        return Listener("tls", host or "", int(port))
+    if protocol == "tcp":
+        return Listener("tcp", host or "", int(port))
+    raise ValueError(f"Unsupported protocol: {protocol}")
+
+
+def parse_forward_target(raw: str):
+    """Parse "udp://host:port", "tcp://host:port", "tls://host:port" or "file:///path".
+
+    Returns (scheme, host, port) for a syslog server and ("file", path, None)
+    for a file. The path must be absolute. Raises ValueError.
+    """
+    item = (raw or "").strip()
+    scheme, sep, rest = item.partition("://")
+    if sep and scheme.lower() == "file":
+        if not os.path.isabs(rest):
+            raise ValueError(f"File forward target needs an absolute path: '{item}'")
+        return "file", rest, None
+    listener = parse_listener(item)
+    if not listener.host:
+        raise ValueError(f"Forward target needs a host: '{item}'")
+    return listener.scheme, listener.host, listener.port
+
+
+def valid_forward_target(raw: str) -> bool:
+    """True for an empty target (forwarding off) or one that parse_forward_target accepts."""
+    if not (raw or "").strip():
+        return True
+    try:
+        parse_forward_target(raw)
+    except ValueError:
+        return False
+    return True
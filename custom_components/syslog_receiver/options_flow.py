@@ -1,6 +1,9 @@
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.helpers import config_validation as cv
+from .allowlist import parse_allowed_ips
+from .listeners import parse_listeners, valid_forward_target
+from .rules import parse_rules
 from .const import (
     DEFAULT_HOST,
     DEFAULT_PORT,
@@ -14,6 +17,42 @@ from .const import (
     MIN_SEVERITY_LEVELS,
     DEFAULT_ENCODING,
     COMMON_ENCODINGS,
+    DEFAULT_BATCH_EVENTS,
+    DEFAULT_BATCH_INTERVAL,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_OVERFLOW_POLICY,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_BURST,
+    OVERFLOW_POLICIES,
+    DEFAULT_SENSOR_UPDATE_INTERVAL,
+    DEFAULT_MAX_FRAME_SIZE,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_UDP_SOCKETS,
+    DEFAULT_UDP_RCVBUF,
+    DEFAULT_WORKER_MODE,
+    DEFAULT_WORKER_COUNT,
+    WORKER_MODES,
+    DEFAULT_ARCHIVE,
+    DEFAULT_ARCHIVE_SIZE,
+    DEFAULT_LISTENERS,
+    DEFAULT_RULES,
+    DEFAULT_DEDUP_WINDOW,
+    DEFAULT_DEDUP_SIZE,
+    DEFAULT_UDP_ENGINE,
+    UDP_ENGINES,
+    DEFAULT_MAX_CONNECTIONS_PER_SOURCE,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_MAX_TLS_HANDSHAKES,
+    DEFAULT_FORWARD_TARGET,
+    DEFAULT_FORWARD_SCOPE,
+    FORWARD_SCOPES,
+    DEFAULT_FORWARD_QUEUE_SIZE,
+    DEFAULT_FORWARD_FILE_SIZE,
+    DEFAULT_THROTTLE_RATE,
+    DEFAULT_THROTTLE_LAG,
+    DEFAULT_THROTTLE_KEEP_SEVERITY,
 )
 
 class SyslogOptionsFlowHandler(config_entries.OptionsFlow):
@@ -22,6 +61,7 @@ class SyslogOptionsFlowHandler(config_entries.OptionsFlow):
         self._temp_user_input = None
 
     async def async_step_init(self, user_input=None):
+        errors = {}
         data = self._config_entry.options or self._config_entry.data
 
         # Get previously set encoding, fall back to default
@@ -38,26 +78,67 @@ class SyslogOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Required("host", default=data.get("host", DEFAULT_HOST)): str,
                 vol.Required("port", default=data.get("port", DEFAULT_PORT)): int,
                 vol.Required("protocol", default=data.get("protocol", DEFAULT_PROTOCOL)): vol.In(("UDP", "TCP")),
+                vol.Optional("listeners", default=data.get("listeners", DEFAULT_LISTENERS)): str,
+                vol.Optional("udp_sockets", default=data.get("udp_sockets", DEFAULT_UDP_SOCKETS)): vol.All(int, vol.Range(min=1, max=64)),
+                vol.Optional("udp_rcvbuf", default=data.get("udp_rcvbuf", DEFAULT_UDP_RCVBUF)): vol.All(int, vol.Range(min=0)),
+                vol.Optional("udp_engine", default=data.get("udp_engine", DEFAULT_UDP_ENGINE)): vol.In(UDP_ENGINES),
                 vol.Required("use_tls", default=data.get("use_tls", DEFAULT_USE_TLS)): bool,
+                vol.Optional("max_frame_size", default=data.get("max_frame_size", DEFAULT_MAX_FRAME_SIZE)): vol.All(int, vol.Range(min=480)),
+                vol.Optional("max_connections", default=data.get("max_connections", DEFAULT_MAX_CONNECTIONS)): vol.All(int, vol.Range(min=0)),
+                vol.Optional("max_connections_per_source", default=data.get("max_connections_per_source", DEFAULT_MAX_CONNECTIONS_PER_SOURCE)): vol.All(int, vol.Range(min=0)),
+                vol.Optional("idle_timeout", default=data.get("idle_timeout", DEFAULT_IDLE_TIMEOUT)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional("read_timeout", default=data.get("read_timeout", DEFAULT_READ_TIMEOUT)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional("max_tls_handshakes", default=data.get("max_tls_handshakes", DEFAULT_MAX_TLS_HANDSHAKES)): vol.All(int, vol.Range(min=0)),
                 vol.Optional("certfile", default=data.get("certfile", DEFAULT_CERTFILE)): cv.string,
                 vol.Optional("keyfile", default=data.get("keyfile", DEFAULT_KEYFILE)): cv.string,
                 vol.Required("allowed_ips", default=data.get("allowed_ips", DEFAULT_ALLOWED_IPS)): str,
                 vol.Required("min_severity", default=data.get("min_severity", DEFAULT_MIN_SEVERITY)): vol.In(tuple(MIN_SEVERITY_LEVELS.keys())),
+                vol.Optional("rules", default=data.get("rules", DEFAULT_RULES)): str,
+                vol.Optional("throttle_rate", default=data.get("throttle_rate", DEFAULT_THROTTLE_RATE)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional("throttle_lag", default=data.get("throttle_lag", DEFAULT_THROTTLE_LAG)): vol.All(int, vol.Range(min=0)),
+                vol.Optional("throttle_keep_severity", default=data.get("throttle_keep_severity", DEFAULT_THROTTLE_KEEP_SEVERITY)): vol.In(tuple(MIN_SEVERITY_LEVELS.keys())),
                 vol.Required("enable_sensors", default=data.get("enable_sensors", False)): bool,
+                vol.Optional("sensor_update_interval", default=data.get("sensor_update_interval", DEFAULT_SENSOR_UPDATE_INTERVAL)): vol.All(vol.Coerce(float), vol.Range(min=0)),
                 vol.Optional("encoding", default=saved_encoding): vol.In(encoding_list),
+                vol.Optional("archive", default=data.get("archive", DEFAULT_ARCHIVE)): bool,
+                vol.Optional("archive_size", default=data.get("archive_size", DEFAULT_ARCHIVE_SIZE)): vol.All(int, vol.Range(min=1)),
+                vol.Optional("worker_mode", default=data.get("worker_mode", DEFAULT_WORKER_MODE)): vol.In(WORKER_MODES),
+                vol.Optional("worker_count", default=data.get("worker_count", DEFAULT_WORKER_COUNT)): vol.All(int, vol.Range(min=1, max=16)),
+                vol.Optional("batch_events", default=data.get("batch_events", DEFAULT_BATCH_EVENTS)): bool,
+                vol.Optional("batch_interval", default=data.get("batch_interval", DEFAULT_BATCH_INTERVAL)): vol.All(int, vol.Range(min=10)),
+                vol.Optional("batch_size", default=data.get("batch_size", DEFAULT_BATCH_SIZE)): vol.All(int, vol.Range(min=1)),
+                vol.Optional("queue_size", default=data.get("queue_size", DEFAULT_QUEUE_SIZE)): vol.All(int, vol.Range(min=1)),
+                vol.Optional("overflow_policy", default=data.get("overflow_policy", DEFAULT_OVERFLOW_POLICY)): vol.In(OVERFLOW_POLICIES),
+                vol.Optional("rate_limit", default=data.get("rate_limit", DEFAULT_RATE_LIMIT)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional("rate_burst", default=data.get("rate_burst", DEFAULT_RATE_BURST)): vol.All(int, vol.Range(min=1)),
+                vol.Optional("dedup_window", default=data.get("dedup_window", DEFAULT_DEDUP_WINDOW)): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional("dedup_size", default=data.get("dedup_size", DEFAULT_DEDUP_SIZE)): vol.All(int, vol.Range(min=1)),
+                vol.Optional("forward_target", default=data.get("forward_target", DEFAULT_FORWARD_TARGET)): str,
+                vol.Optional("forward_scope", default=data.get("forward_scope", DEFAULT_FORWARD_SCOPE)): vol.In(FORWARD_SCOPES),
+                vol.Optional("forward_queue_size", default=data.get("forward_queue_size", DEFAULT_FORWARD_QUEUE_SIZE)): vol.All(int, vol.Range(min=1)),
+                vol.Optional("forward_file_size", default=data.get("forward_file_size", DEFAULT_FORWARD_FILE_SIZE)): vol.All(int, vol.Range(min=1)),
             }
         )
         if user_input is not None:
+            _, invalid = parse_allowed_ips(user_input.get("allowed_ips", ""))
+            if invalid:
+                errors["allowed_ips"] = "invalid_allowed_ips"
+            elif parse_listeners(user_input.get("listeners", ""))[1]:
+                errors["listeners"] = "invalid_listeners"
+            elif parse_rules(user_input.get("rules", ""))[1]:
+                errors["rules"] = "invalid_rules"
+            elif not valid_forward_target(user_input.get("forward_target", "")):
+                errors["forward_target"] = "invalid_forward_target"
             # Check if user selected "Other…" and trigger custom step
-            if user_input.get("encoding") == "Other…":
+            elif user_input.get("encoding") == "Other…":
                 self._temp_user_input = user_input
                 return await self.async_step_custom_encoding()
+            else:
+                return self.async_create_entry(
+                    title=user_input.get("instance_name", ""), data=user_input
+                )
 
-            return self.async_create_entry(
-                title=user_input.get("instance_name", ""), data=user_input
-            )
-
-        return self.async_show_form(step_id="init", data_schema=schema)
+        return self.async_show_form(step_id="init", data_schema=schema, errors=errors)
 
     async def async_step_custom_encoding(self, user_input=None):
         custom_encoding_schema = vol.Schema({
@@ -0,0 +1,150 @@
+"""Single-pass parser for RFC 5424 and RFC 3164 (BSD) syslog headers.
+
+The parser works on the text following the <PRI> header. It returns the header
+fields and the free-form message body; missing or NILVALUE ("-") fields are
+None. Header prefixes that repeat across messages (hostname and app tag of a
+BSD message, structured data of an RFC 5424 message) are parsed once and kept
+in LRU caches.
+"""
+import re
+from functools import lru_cache
+
+CACHE_SIZE = 1024
+
+# <PRI>1 TIMESTAMP HOSTNAME APP-NAME PROCID MSGID STRUCTURED-DATA [MSG]
+# TIMESTAMP is NILVALUE or an RFC 3339 date-time, STRUCTURED-DATA is NILVALUE or "[..."
+_RFC5424_RE = re.compile(
+    r"1 (-|\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\S*) (\S+) (\S+) (\S+) (\S+) ([-\[].*)",
+    re.DOTALL,
+)
+
+# <PRI>Mmm dd hh:mm:ss HOSTNAME TAG[PID]: MSG (some devices send ISO timestamps)
+_RFC3164_RE = re.compile(
+    r"([A-Z][a-z]{2} [ \d]\d \d\d:\d\d:\d\d(?:\.\d+)?|\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d\S*):? (.*)",
+    re.DOTALL,
+)
+
+_SD_ELEMENT_RE = re.compile(r'\[[^\s\]=]+(?: +[^\s=\]]+="(?:[^"\\]|\\.)*")* *\]', re.DOTALL)
+_SD_ID_RE = re.compile(r"\[([^\s\]=]+)")
+_SD_PARAM_RE = re.compile(r'([^\s=\]]+)="((?:[^"\\]|\\.)*)"', re.DOTALL)
+_SD_UNESCAPE_RE = re.compile(r'\\(["\\\]])')
+
+_TAG_RE = re.compile(r"([^\s\[\]:]{1,48})(?:\[([^\]]*)\])?:$")
+
+RFC5424 = "rfc5424"
+RFC3164 = "rfc3164"
+
+
+def _nil(value):
+    return None if value == "-" else value
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_structured_data(text: str):
+    """Parse `[id k="v" ...][id2 ...]` into ((id, ((k, v), ...)), ...).
+
+    The cached result is immutable; _structured_data() builds the dict of each event.
+    """
+    return tuple(
+        (
+            _SD_ID_RE.match(element).group(1),
+            tuple((key, _SD_UNESCAPE_RE.sub(r"\1", value)) for key, value in _SD_PARAM_RE.findall(element)),
+        )
+        for element in _SD_ELEMENT_RE.findall(text)
+    )
+
+
+def _structured_data(text: str) -> dict:
+    """{id: {k: v}} for the structured data text, a fresh dict per event."""
+    return {sd_id: dict(params) for sd_id, params in _parse_structured_data(text)}
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def _parse_bsd_prefix(first: str, second: str):
+    """Split the tokens after a BSD timestamp into (hostname, app_name, procid, consumed)."""
+    m = _TAG_RE.match(first)
+    if m:
+        # No hostname, the first token is already the tag (pfSense, Ubiquiti)
+        return None, m.group(1), m.group(2) or None, 1
+    m = _TAG_RE.match(second)
+    if m:
+        return first, m.group(1), m.group(2) or None, 2
+    return first, None, None, 1
+
+
+def _parse_rfc5424(m):
+    timestamp, hostname, app_name, procid, msgid, rest = m.groups()
+    structured_data = None
+    if rest.startswith("["):
+        pos = 0
+        while rest.startswith("[", pos):
+            element = _SD_ELEMENT_RE.match(rest, pos)
+            if element is None:
+                break
+            pos = element.end()
+        if pos:
+            structured_data = _structured_data(rest[:pos])
+            rest = rest[pos:]
+    elif rest.startswith("-"):
+        rest = rest[1:]
+    body = rest[1:] if rest.startswith(" ") else rest
+    if body.startswith("\ufeff"):
+        body = body[1:]
+    return {
+        "format": RFC5424,
+        "timestamp": _nil(timestamp),
+        "hostname": _nil(hostname),
+        "app_name": _nil(app_name),
+        "procid": _nil(procid),
+        "msgid": _nil(msgid),
+        "structured_data": structured_data,
+        "body": body,
+    }
+
+
+def _parse_rfc3164(m):
+    timestamp, rest = m.groups()
+    parts = rest.split(" ", 2)
+    hostname, app_name, procid, consumed = _parse_bsd_prefix(parts[0], parts[1] if len(parts) > 1 else "")
+    if consumed >= len(parts):
+        body = ""
+    elif consumed == 1:
+        body = rest[len(parts[0]) + 1:]
+    else:
+        body = parts[2]
+    return {
+        "format": RFC3164,
+        "timestamp": timestamp,
+        "hostname": hostname,
+        "app_name": app_name,
+        "procid": procid,
+        "msgid": None,
+        "structured_data": None,
+        "body": body,
+    }
+
+
+def parse(text: str) -> dict:
+    """Parse the header fields of the text following a <PRI> header."""
+    m = _RFC5424_RE.match(text)
+    if m:
+        return _parse_rfc5424(m)
+    m = _RFC3164_RE.match(text)
+    if m:
+        return _parse_rfc3164(m)
+    return {
+        "format": None,
+        "timestamp": None,
+        "hostname": None,
+        "app_name": None,
+        "procid": None,
+        "msgid": None,
+        "structured_data": None,
+        "body": text,
+    }
+
+
+def cache_clear():
+    """Drop the cached header prefixes."""
+    _parse_structured_data.cache_clear()
+    _parse_bsd_prefix.cache_clear()
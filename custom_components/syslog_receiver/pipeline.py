@@ -0,0 +1,122 @@
+import codecs
+import logging
+import re
+from .allowlist import AllowList
+from .const import DEFAULT_ENCODING, DEFAULT_MIN_SEVERITY, MIN_SEVERITY_LEVELS
+from .parser import parse
+from .rules import RuleSet, parse_rules
+
+_LOGGER = logging.getLogger(__name__)
+
+# Syslog priority header (e.g. <14>), compiled once for every instance
+PRI_RE = re.compile(r"<(\d+)>(.*)")
+
+# Every valid header as raw bytes (b"<0>" to b"<191>"), to read it before decoding
+PRI_HEADERS = {b"<%d>" % pri: pri for pri in range(192)}
+
+
+class FilterPipeline:
+    """Compiled filter configuration of one syslog receiver instance.
+
+    Everything that depends on the entry options is resolved here once, so the
+    per-packet path only does attribute lookups. The object is never mutated:
+    an option change builds a new pipeline which replaces the old one.
+    """
+
+    __slots__ = ("encoding", "allowed_ips", "min_level", "match_pri", "raw_pri", "rules")
+
+    def __init__(self, encoding=None, allowed_ips="", min_severity=DEFAULT_MIN_SEVERITY, rules=""):
+        self.encoding = self._resolve_encoding(encoding)
+        self.allowed_ips = AllowList(allowed_ips)
+        self.min_level = MIN_SEVERITY_LEVELS.get(min_severity, MIN_SEVERITY_LEVELS[DEFAULT_MIN_SEVERITY])
+        self.match_pri = PRI_RE.match
+        # The header can be read before decoding if the encoding stores ASCII as ASCII
+        self.raw_pri = PRI_HEADERS.get if self._ascii_compatible(self.encoding) else None
+        self.rules = self._compile_rules(rules)
+
+    @staticmethod
+    def _resolve_encoding(encoding):
+        """Return the canonical codec name, falling back to UTF-8 if it is unknown."""
+        if not encoding:
+            return DEFAULT_ENCODING
+        try:
+            return codecs.lookup(encoding).name
+        except LookupError:
+            _LOGGER.error("Invalid encoding '%s'. Falling back to default.", encoding)
+            return DEFAULT_ENCODING
+
+    @staticmethod
+    def _ascii_compatible(encoding) -> bool:
+        try:
+            return "<0>\n".encode(encoding) == b"<0>\n"
+        except (UnicodeError, LookupError):
+            return False
+
+    @staticmethod
+    def _compile_rules(raw):
+        """Compile the routing rules, skipping the ones that do not parse."""
+        rules, invalid = parse_rules(raw)
+        for item in invalid:
+            _LOGGER.warning("Ignoring invalid routing rule %s", item)
+        return RuleSet(rules)
+
+    def is_allowed(self, src_ip: str) -> bool:
+        """Return True if messages from src_ip pass the source filter."""
+        return src_ip in self.allowed_ips
+
+    def below_min_severity(self, data: bytes) -> bool:
+        """Return True if the raw <PRI> header puts the message below the minimum severity."""
+        raw_pri = self.raw_pri
+        if raw_pri is None:
+            return False
+        head = bytes(data[:5])
+        pri = raw_pri(head[:head.find(b">") + 1])
+        return pri is not None and pri & 0x07 > self.min_level
+
+    def prepare(self, data: bytes, src_ip: str):
+        """Severity-filter, decode and parse one message.
+
+        Returns the event data, or None if the message is below the minimum
+        severity. Has no side effects, so it can run in a worker process.
+        """
+        # Read the <PRI> header from the raw bytes, so messages below the minimum
+        # severity are dropped without being decoded
+        raw_pri = self.raw_pri
+        if raw_pri is not None:
+            head = bytes(data[:5])
+            start = head.find(b">") + 1
+            pri = raw_pri(head[:start])
+            if pri is not None:
+                severity = pri & 0x07
+                if severity > self.min_level:
+                    return None
+                # The header is ASCII, so it is as long in text as in bytes.
+                # Like the text path below, the body ends at the first newline.
+                text = str(data, self.encoding, "replace")
+                newline = text.find("\n", start)
+                body = (text[start:newline] if newline >= 0 else text[start:]).strip()
+                event_data = {"message": body, "source_ip": src_ip, "severity": severity, "facility": pri >> 3}
+                event_data.update(parse(body))
+                return event_data
+
+        # No plain header at the start of the data, or an encoding that is not
+        # ASCII-compatible: decode first. str() accepts bytes and memoryviews alike
+        message = str(data, self.encoding, "replace").strip()
+
+        # Parse syslog priority header (e.g., <14>) and extract severity
+        m = self.match_pri(message)
+        if m:
+            pri = int(m.group(1))
+            severity = pri & 0x07
+            if severity > self.min_level:
+                return None
+            facility = pri >> 3
+            body = m.group(2).strip()
+        else:
+            severity = None
+            facility = None
+            body = message
+
+        event_data = {"message": body, "source_ip": src_ip, "severity": severity, "facility": facility}
+        event_data.update(parse(body))
+        return event_data
@@ -0,0 +1,279 @@
+import logging
+import re
+import shlex
+from typing import NamedTuple
+from .allowlist import parse_address
+from .const import DOMAIN, EVENT_MESSAGE, MIN_SEVERITY_LEVELS
+
+_LOGGER = logging.getLogger(__name__)
+
+# Rule action that discards the message
+DROP = "drop"
+
+# Fields matched by exact value through a hash index: rule field -> event data key
+EXACT_FIELDS = {
+    "source": "source_ip",
+    "hostname": "hostname",
+    "app_name": "app_name",
+    "facility": "facility",
+}
+
+# Facility keywords accepted next to their numbers (RFC 5424, section 6.2.1)
+FACILITIES = {
+    "kern": 0, "user": 1, "mail": 2, "daemon": 3, "auth": 4, "syslog": 5, "lpr": 6, "news": 7,
+    "uucp": 8, "cron": 9, "authpriv": 10, "ftp": 11, "ntp": 12, "security": 13, "console": 14,
+    "clock": 15, **{f"local{n}": 16 + n for n in range(8)},
+}
+
+_CONDITION_RE = re.compile(r"(\w+)(<=|=)(.*)", re.DOTALL)
+_NAME_RE = re.compile(r"[a-z0-9_]+")
+
+# Backreferences point at other groups once patterns are joined: "\1", "\g<1>", "(?P=name)"
+_BACKREF_RE = re.compile(r"\\[1-9]|\\g<|\(\?P=")
+
+
+class Rule(NamedTuple):
+    """One parsed routing rule; all of its conditions must hold."""
+
+    action: str             # event name suffix, or DROP
+    exact: dict             # rule field -> frozenset of accepted values
+    severities: frozenset   # accepted severity levels, or None for any
+    keyword: str | None
+    regex: str | None
+
+    @property
+    def event_type(self):
+        return None if self.action == DROP else f"{DOMAIN}_{self.action}"
+
+
+def _source_values(value: str):
+    """The source_ip strings of an address: IPv4 senders of dual-stack listeners arrive IPv4-mapped."""
+    addr = parse_address(value)
+    if addr.version == 4:
+        return [str(addr), f"::ffff:{addr}"]
+    return [str(addr)]
+
+
+def _parse_rule(tokens) -> Rule:
+    if len(tokens) < 3 or tokens[-2] != "->":
+        raise ValueError("expected 'conditions -> action'")
+    action = tokens[-1].lower()
+    if not _NAME_RE.fullmatch(action):
+        raise ValueError(f"invalid action '{tokens[-1]}'")
+    exact = {}
+    severities = None
+    keyword = regex = None
+    for token in tokens[:-2]:
+        m = _CONDITION_RE.fullmatch(token)
+        if not m:
+            raise ValueError(f"invalid condition '{token}'")
+        field, op, value = m.groups()
+        if field == "severity":
+            if value not in MIN_SEVERITY_LEVELS:
+                raise ValueError(f"unknown severity '{value}'")
+            level = MIN_SEVERITY_LEVELS[value]
+            levels = frozenset(range(level + 1)) if op == "<=" else frozenset((level,))
+            severities = levels if severities is None else severities & levels
+            continue
+        if op != "=":
+            raise ValueError(f"'<=' only applies to severity, not '{field}'")
+        if field in EXACT_FIELDS:
+            values = [item.strip() for item in value.split(",") if item.strip()]
+            if field == "facility":
+                values = [FACILITIES[v] if v in FACILITIES else int(v) for v in values]
+            elif field == "source":
+                values = [item for v in values for item in _source_values(v)]
+            if not values or field in exact:
+                raise ValueError(f"invalid {field} condition '{token}'")
+            exact[field] = frozenset(values)
+        elif field == "keyword" and keyword is None and value:
+            keyword = value
+        elif field == "regex" and regex is None and value:
+            re.compile(value)
+            regex = value
+        else:
+            raise ValueError(f"invalid condition '{token}'")
+    return Rule(action, exact, severities, keyword, regex)
+
+
+def parse_rules(raw: str):
+    """Split the rules option into parsed rules and a list of invalid rule texts.
+
+    Rules are separated by ";" or newlines and read "conditions -> action",
+    e.g. ``app_name=sshd keyword="Failed password" -> ssh_login``.
+    """
+    rules = []
+    invalid = []
+    lexer = shlex.shlex((raw or "").replace("\n", ";"), posix=True, punctuation_chars=";")
+    lexer.whitespace_split = True
+    tokens = []
+    try:
+        all_tokens = list(lexer) + [";"]
+    except ValueError:  # unbalanced quotes
+        return [], [raw]
+    for token in all_tokens:
+        if token.strip(";"):
+            tokens.append(token)
+            continue
+        if tokens:
+            try:
+                rules.append(_parse_rule(tokens))
+            except (ValueError, KeyError, re.error) as ex:
+                invalid.append(f"{' '.join(tokens)} ({ex})")
+            tokens = []
+    return rules, invalid
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton that finds every keyword of a rule set in one pass.
+
+    The goto and failure functions are folded into a complete transition
+    table per state, and each state carries the OR of the rule bits of every
+    keyword ending there (including through failure links), so scanning is
+    one dict lookup per character. Most messages contain no keyword at all;
+    a single alternation regex, which runs in C, rules those out before the
+    automaton is walked.
+    """
+
+    __slots__ = ("_delta", "_out", "_prefilter")
+
+    def __init__(self, keywords):
+        """keywords: {keyword: rule bitmask}."""
+        goto = [{}]
+        out = [0]
+        for keyword, mask in keywords.items():
+            state = 0
+            for ch in keyword:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append(0)
+                state = nxt
+            out[state] |= mask
+
+        # Breadth-first: failure links, inherited outputs and full transitions
+        delta = [dict(goto[0])] + [None] * (len(goto) - 1)
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for state in queue:
+            delta[state] = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                delta[state][ch] = nxt
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                out[nxt] |= out[fail[nxt]]
+                queue.append(nxt)
+        self._delta = delta
+        self._out = out
+        self._prefilter = re.compile("|".join(map(re.escape, keywords))).search
+
+    def match(self, text: str) -> int:
+        """Return the OR of the rule bits of every keyword found in text."""
+        if not self._prefilter(text):
+            return 0
+        delta = self._delta
+        out = self._out
+        state = 0
+        found = 0
+        for ch in text:
+            state = delta[state].get(ch, 0)
+            found |= out[state]
+        return found
+
+
+class RuleSet:
+    """Compiled routing rules: the first rule whose conditions all hold wins.
+
+    Every rule is a bit in an integer. Exact-value conditions are hash
+    indexes from value to the bits of the rules accepting it, severity is a
+    table per level, keywords are found by one KeywordMatcher pass and
+    regexes are pre-screened by one combined alternation. Matching ANDs these
+    masks, so its cost does not grow with the number of rules; only rules
+    left as candidates have their own regex run.
+    """
+
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self._event_types = [rule.event_type for rule in self.rules]
+        self._all = (1 << len(self.rules)) - 1
+
+        self._exact = []
+        for field, key in EXACT_FIELDS.items():
+            index = {}
+            wild = 0
+            for bit, rule in enumerate(self.rules):
+                values = rule.exact.get(field)
+                if values is None:
+                    wild |= 1 << bit
+                    continue
+                for value in values:
+                    index[value] = index.get(value, 0) | 1 << bit
+            if index:
+                self._exact.append((key, index, wild))
+
+        self._severity = [0] * 8
+        self._no_severity = 0
+        for bit, rule in enumerate(self.rules):
+            if rule.severities is None:
+                self._no_severity |= 1 << bit
+                levels = range(8)
+            else:
+                levels = rule.severities
+            for level in levels:
+                self._severity[level] |= 1 << bit
+
+        keywords = {}
+        self._keyword_rules = 0
+        for bit, rule in enumerate(self.rules):
+            if rule.keyword is not None:
+                keywords[rule.keyword] = keywords.get(rule.keyword, 0) | 1 << bit
+                self._keyword_rules |= 1 << bit
+        self._keywords = KeywordMatcher(keywords) if keywords else None
+
+        self._regex_rules = 0
+        self._regexes = {}
+        for bit, rule in enumerate(self.rules):
+            if rule.regex is not None:
+                self._regex_rules |= 1 << bit
+                self._regexes[bit] = re.compile(rule.regex).search
+        self._combined = None
+        patterns = [rule.regex for rule in self.rules if rule.regex]
+        if patterns and any(_BACKREF_RE.search(pattern) for pattern in patterns):
+            # Joined, the groups are renumbered and a backreference would match the wrong group
+            _LOGGER.debug("Routing regexes use backreferences, matching them separately")
+        elif patterns:
+            try:
+                self._combined = re.compile("|".join(f"(?:{pattern})" for pattern in patterns)).search
+            except re.error:
+                # e.g. the same group name in two patterns; run them one by one
+                _LOGGER.debug("Routing regexes cannot be combined, matching them separately")
+
+    def __bool__(self):
+        return bool(self.rules)
+
+    def route(self, event_data: dict):
+        """Return the event type for a message, or None if a rule drops it."""
+        candidates = self._all
+        for key, index, wild in self._exact:
+            candidates &= index.get(event_data.get(key), 0) | wild
+            if not candidates:
+                return EVENT_MESSAGE
+        severity = event_data["severity"]
+        candidates &= self._no_severity if severity is None else self._severity[severity]
+        if not candidates:
+            return EVENT_MESSAGE
+
+        message = event_data["message"]
+        if candidates & self._keyword_rules:
+            candidates &= self._keywords.match(message) | ~self._keyword_rules
+        if candidates & self._regex_rules and self._combined is not None and not self._combined(message):
+            candidates &= ~self._regex_rules
+
+        while candidates:
+            low = candidates & -candidates
+            bit = low.bit_length() - 1
+            if not low & self._regex_rules or self._regexes[bit](message):
+                return self._event_types[bit]
+            candidates ^= low
+        return EVENT_MESSAGE
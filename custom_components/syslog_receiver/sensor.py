@@ -1,12 +1,102 @@
 import logging
-from homeassistant.components.sensor import SensorEntity
+from datetime import timedelta
+from homeassistant.components.sensor import (
+    SensorDeviceClass,
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.const import EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from .const import DOMAIN
+from homeassistant.helpers.event import async_call_later
+from .const import DOMAIN, DEFAULT_SENSOR_UPDATE_INTERVAL
 
 _LOGGER = logging.getLogger(__name__)
 
+# Refresh interval of the diagnostic counter sensors
+SCAN_INTERVAL = timedelta(seconds=30)
+
+STATS_SENSORS = (
+    SensorEntityDescription(
+        key="received",
+        name="Messages received",
+        native_unit_of_measurement="messages",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="accepted",
+        name="Messages accepted",
+        native_unit_of_measurement="messages",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="dropped",
+        name="Messages dropped",
+        native_unit_of_measurement="messages",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="forwarded",
+        name="Messages forwarded",
+        native_unit_of_measurement="messages",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="decode_errors",
+        name="Decode errors",
+        native_unit_of_measurement="messages",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="bytes_received",
+        name="Bytes received",
+        native_unit_of_measurement=UnitOfInformation.BYTES,
+        device_class=SensorDeviceClass.DATA_SIZE,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="tcp_connections",
+        name="TCP connections",
+        native_unit_of_measurement="connections",
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="latency_p50_us",
+        name="Processing time p50",
+        native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+    SensorEntityDescription(
+        key="latency_p99_us",
+        name="Processing time p99",
+        native_unit_of_measurement=UnitOfTime.MICROSECONDS,
+        device_class=SensorDeviceClass.DURATION,
+        state_class=SensorStateClass.MEASUREMENT,
+        entity_category=EntityCategory.DIAGNOSTIC,
+    ),
+)
+
+# Breakdown exposed as attributes of some of the counter sensors
+STATS_ATTRIBUTES = {
+    "received": ("severity", "top_sources", "udp_sockets", "udp_rcvbuf", "udp_batch_size"),
+    "accepted": ("duplicates", "throttle_threshold", "throttle_sampled_severity", "throttle_sample_rate", "throttle_step", "throttle_message_rate", "throttle_loop_lag_ms"),
+    "dropped": ("dropped_source", "dropped_severity", "dropped_throttled", "dropped_rule", "dropped_rate_limited", "dropped_overflow", "dropped_backlog", "tcp_rejected", "tcp_truncated", "udp_kernel_drops"),
+    "tcp_connections": ("tcp_sources", "tcp_rejected_source", "tcp_rejected_ip", "tcp_idle_timeouts", "tcp_read_timeouts", "tls_handshakes", "tls_rejected", "tls_failed"),
+    "forwarded": ("forward_queue", "forward_dropped", "forward_errors", "forward_connected"),
+    "latency_p99_us": ("latency_histogram",),
+}
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
@@ -18,17 +108,30 @@ async def async_setup_entry(
         return
 
     name = entry.data.get("instance_name", entry.title)
-    async_add_entities([SyslogSensor(server, entry.entry_id, name)], update_before_add=True)
+    interval = entry.options.get(
+        "sensor_update_interval", entry.data.get("sensor_update_interval", DEFAULT_SENSOR_UPDATE_INTERVAL)
+    )
+    entities = [SyslogSensor(server, entry.entry_id, name, interval)]
+    entities += [SyslogStatsSensor(server, entry.entry_id, name, description) for description in STATS_SENSORS]
+    async_add_entities(entities, update_before_add=True)
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     return True
 
 class SyslogSensor(SensorEntity):
-    def __init__(self, server, entry_id: str, name: str):
+    """Last received message, written at most once per update interval."""
+
+    _attr_should_poll = False
+
+    def __init__(self, server, entry_id: str, name: str, update_interval: float = DEFAULT_SENSOR_UPDATE_INTERVAL):
         self.server = server
         self.entry_id = entry_id
         self._attr_name = name
         self._attr_unique_id = f"{DOMAIN}_{entry_id}"
+        self.update_interval = update_interval
+        self._pending = 0          # messages received since the last state write
+        self._published = 0        # messages represented by the current state
+        self._unsub_throttle = None
 
     @property
     def state(self):
@@ -36,7 +139,71 @@ class SyslogSensor(SensorEntity):
 
     @property
     def extra_state_attributes(self):
-        return {"source_ip": self.server.last_source, "severity": self.server.last_severity}
+        return {
+            "source_ip": self.server.last_source,
+            "severity": self.server.last_severity,
+            "messages_since_last_update": self._published,
+            "dropped_rate_limited": self.server.dropped_rate_limited,
+            "dropped_overflow": self.server.dropped_overflow,
+        }
 
     async def async_added_to_hass(self):
-        self.server.sensors.append(self)
\ No newline at end of file
+        self.server.sensors.append(self)
+
+    async def async_will_remove_from_hass(self):
+        if self in self.server.sensors:
+            self.server.sensors.remove(self)
+        if self._unsub_throttle is not None:
+            self._unsub_throttle()
+            self._unsub_throttle = None
+
+    @callback
+    def async_message_received(self):
+        """Called by the server for every accepted message.
+
+        The first message after a quiet period is written right away; messages
+        arriving within the next update interval are coalesced into a single
+        write of the latest one when the interval ends.
+        """
+        self._pending += 1
+        if self._unsub_throttle is None:
+            self._async_publish()
+
+    @callback
+    def _async_publish(self):
+        self._published = self._pending
+        self._pending = 0
+        self.async_write_ha_state()
+        if self.update_interval:
+            self._unsub_throttle = async_call_later(self.hass, self.update_interval, self._async_window_closed)
+
+    @callback
+    def _async_window_closed(self, _now):
+        self._unsub_throttle = None
+        if self._pending:
+            self._async_publish()
+
+class SyslogStatsSensor(SensorEntity):
+    """Diagnostic counter of the receiver, polled every SCAN_INTERVAL."""
+
+    def __init__(self, server, entry_id: str, name: str, description: SensorEntityDescription):
+        self.server = server
+        self.entry_id = entry_id
+        self.entity_description = description
+        self._attr_name = f"{name} {description.name}"
+        self._attr_unique_id = f"{DOMAIN}_{entry_id}_{description.key}"
+        self._stats = {}
+
+    @property
+    def native_value(self):
+        return self._stats.get(self.entity_description.key)
+
+    @property
+    def extra_state_attributes(self):
+        keys = STATS_ATTRIBUTES.get(self.entity_description.key)
+        if not keys:
+            return None
+        return {key: self._stats.get(key) for key in keys}
+
+    async def async_update(self):
+        self._stats = await self.hass.async_add_executor_job(self.server.get_stats)
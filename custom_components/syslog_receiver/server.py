@@ -1,23 +1,146 @@
 import asyncio
 import ssl
 import logging
-import re
+import os
 import socket
-from .const import DOMAIN, MIN_SEVERITY_LEVELS
+from time import perf_counter_ns
+from .const import (
+    EVENT_MESSAGE,
+    DEFAULT_BATCH_EVENTS,
+    DEFAULT_BATCH_INTERVAL,
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_QUEUE_SIZE,
+    DEFAULT_OVERFLOW_POLICY,
+    DEFAULT_RATE_LIMIT,
+    DEFAULT_RATE_BURST,
+    DEFAULT_MAX_FRAME_SIZE,
+    DEFAULT_MAX_CONNECTIONS,
+    DEFAULT_MAX_CONNECTIONS_PER_SOURCE,
+    DEFAULT_IDLE_TIMEOUT,
+    DEFAULT_READ_TIMEOUT,
+    DEFAULT_MAX_TLS_HANDSHAKES,
+    DEFAULT_UDP_SOCKETS,
+    DEFAULT_UDP_RCVBUF,
+    DEFAULT_WORKER_MODE,
+    DEFAULT_WORKER_COUNT,
+    DEFAULT_ARCHIVE,
+    DEFAULT_ARCHIVE_SIZE,
+    DEFAULT_LISTENERS,
+    DEFAULT_SENSOR_UPDATE_INTERVAL,
+    DEFAULT_RULES,
+    DEFAULT_DEDUP_WINDOW,
+    DEFAULT_DEDUP_SIZE,
+    DEFAULT_UDP_ENGINE,
+    DEFAULT_FORWARD_TARGET,
+    DEFAULT_FORWARD_SCOPE,
+    DEFAULT_FORWARD_QUEUE_SIZE,
+    DEFAULT_FORWARD_FILE_SIZE,
+    DEFAULT_THROTTLE_RATE,
+    DEFAULT_THROTTLE_LAG,
+    DEFAULT_THROTTLE_KEEP_SEVERITY,
+    MIN_SEVERITY_LEVELS,
+)
+from .dedup import Deduplicator
+from .dispatcher import BatchDispatcher, RateLimiter
+from .framing import FrameDecoder
+from .listeners import legacy_listener, parse_listeners
+from .pipeline import FilterPipeline
+from .stats import ReceiverStats
+from .throttle import AdaptiveThrottle
 
 _LOGGER = logging.getLogger(__name__)
 
+# Bytes requested from a TCP stream per read
+TCP_READ_SIZE = 65536
+
+# Batch UDP engine: datagrams drained per wakeup, and the receive buffer they are packed into
+UDP_BATCH = 256
+UDP_ARENA_SIZE = 512 * 1024
+UDP_MAX_DATAGRAM = 65535
+
+# Options a running server applies in place; any other change rebinds the listeners
+LIVE_OPTIONS = frozenset({
+    "allowed_ips", "min_severity", "encoding", "sensor_update_interval",
+    "certfile", "keyfile", "max_frame_size", "max_connections", "rules",
+    "max_connections_per_source", "idle_timeout", "read_timeout", "max_tls_handshakes",
+})
+
+# Per-socket UDP tables with the kernel drop counter (the same counter SO_RXQ_OVFL reports)
+PROC_NET_UDP = ("/proc/net/udp", "/proc/net/udp6")
+
+
+def read_udp_drops(inodes) -> int | None:
+    """Sum the kernel receive-queue drops of the UDP sockets with the given inodes.
+
+    SO_RXQ_OVFL only delivers this counter as ancillary data of recvmsg(),
+    which the asyncio datagram transport never exposes, so it is read from
+    /proc/net/udp instead. Returns None where that table is not available.
+    Does blocking file I/O: call it from an executor.
+    """
+    if not inodes:
+        return None
+    drops = None
+    for path in PROC_NET_UDP:
+        try:
+            with open(path, encoding="ascii") as table:
+                next(table, None)  # header
+                for line in table:
+                    fields = line.split()
+                    if len(fields) >= 13 and int(fields[9]) in inodes:
+                        drops = (drops or 0) + int(fields[12])
+        except OSError:
+            continue
+    return drops
+
+def severity_name(level):
+    """Name of a severity level ("err"), or None."""
+    for name, value in MIN_SEVERITY_LEVELS.items():
+        if value == level:
+            return name
+    return None
+
+def _create_ssl_context(certfile: str, keyfile: str) -> ssl.SSLContext:
+    """Server TLS context with the certificate and key. Reads files: call it from an executor."""
+    context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
+    context.load_cert_chain(certfile=certfile, keyfile=keyfile)
+    return context
+
+async def _close_writer(writer: asyncio.StreamWriter):
+    """Close a TCP session; a peer that already reset the connection is not an error."""
+    writer.close()
+    try:
+        await writer.wait_closed()
+    except OSError:
+        pass
+
 class SyslogServer:
-    """Syslog server for receiving, filtering, and dispatching syslog messages over UDP or TCP."""
+    """Syslog server for receiving, filtering, and dispatching syslog messages over UDP, TCP and TLS listeners."""
 
-    def __init__(self, hass, config, options):
+    def __init__(self, hass, config, options, storage_dir=None):
         """Initialize the server instance with config and optional overrides."""
         self.hass = hass
         self.config = config
         self.options = options
+        self.storage_dir = storage_dir  # Directory of the message archive
 
         self.transports = []  # Active UDP socket transports
+        self.udp_rcvbuf = None        # Effective SO_RCVBUF of the UDP sockets
+        self._udp_inodes = set()      # Inodes of the UDP sockets, to find them in /proc/net/udp
         self.servers = []     # Active TCP server instances
+        self.tcp_connections = 0      # Currently open TCP sessions
+        self.tcp_sources = {}         # Open TCP sessions per source address
+        self.tcp_rejected = 0         # Sessions closed because max_connections was reached
+        self.tcp_rejected_source = 0  # Sessions closed because max_connections_per_source was reached
+        self.tcp_rejected_ip = 0      # Sessions closed because the peer is not in allowed_ips
+        self.tcp_idle_timeouts = 0    # Sessions closed after idle_timeout without data
+        self.tcp_read_timeouts = 0    # Sessions closed because a message was not finished within read_timeout
+        self.tcp_truncated = 0        # TCP frames cut at max_frame_size
+        self.tls_handshakes = 0       # TLS handshakes in progress
+        self.tls_rejected = 0         # Sessions closed because max_tls_handshakes were in progress
+        self.tls_failed = 0           # TLS handshakes that failed or timed out
+
+        # Counters and processing time histogram, see get_stats()
+        self.stats = ReceiverStats()
 
         # For sensor entity support
         self.sensors = []
@@ -25,156 +148,451 @@ class SyslogServer:
         self.last_source = None
         self.last_severity = None
 
-        # Prepare SSL context if TLS is enabled
+        # Compile the filter options once; rebuilt only when options change
+        self._pipeline = self._compile_pipeline()
+
+        # Optional adaptive throttling, duplicate suppression, per-source rate limiting
+        # and batched event dispatch
+        self.throttle = None
+        self.dedup = None
+        self.rate_limiter = None
+        self.batcher = None
+        self._setup_dispatch()
+
+        # Optional off-loop decode/parse workers, created in start()
+        self.workers = None
+
+        # Optional on-disk message archive, opened in start()
+        self.store = None
+
+        # Optional relay to an upstream syslog server or file, started in start().
+        # forward_all relays every message from an allowed source, before any filter.
+        self.forwarder = None
+        self.forward_all = False
+
+        # Sockets to bind, resolved from the options in start(); they all share
+        # the pipeline, counters and sensors above
+        self.listeners = []
+
+        # TLS context of the TLS listeners, loaded in start()
         self.ssl_context = None
-        if self.__get_option("use_tls"):
-            self.ssl_context = ssl.create_default_context(ssl.Purpose.CLIENT_AUTH)
-            cert = self.__get_option("certfile")
-            key = self.__get_option("keyfile")
-            try:
-                self.ssl_context.load_cert_chain(certfile=cert, keyfile=key)
-            except ssl.SSLError as ex:
-                _LOGGER.error("Failed to load TLS cert/key: %s", ex)
-                raise
 
     def __get_option(self, key: str, default=None):
         """Helper to fetch option override or fallback to config."""
         return self.options.get(key, self.config.get(key, default))
-        
-    async def start(self):
-        """Start the syslog listener(s) for UDP or TCP (optionally with TLS)."""
-        host = self.__get_option("host", "")
-        port = self.__get_option("port", "")
-        proto = self.__get_option("protocol", "").lower()
-        loop = asyncio.get_running_loop()
 
-        # Check for malformed IPv6 link-local addresses (scope required)
-        if isinstance(host, str) and host.startswith("fe80::") and "%" not in host:
-            _LOGGER.error(
-                "Link-local IPv6 address '%s' is missing a required interface scope (e.g. %%eth0). "
-                "Binding will fail without this. Please update your host value.",
-                host
+    def _compile_pipeline(self) -> FilterPipeline:
+        """Build the compiled filter pipeline from the current config and options."""
+        return FilterPipeline(
+            encoding=self.__get_option("encoding", None),
+            allowed_ips=self.__get_option("allowed_ips", ""),
+            min_severity=self.__get_option("min_severity", "info"),
+            rules=self.__get_option("rules", DEFAULT_RULES),
+        )
+
+    def _setup_dispatch(self):
+        """Create the throttle, deduplicator, rate limiter and batch dispatcher requested by the options."""
+        throttle_rate = self.__get_option("throttle_rate", DEFAULT_THROTTLE_RATE)
+        throttle_lag = self.__get_option("throttle_lag", DEFAULT_THROTTLE_LAG)
+        if throttle_rate or throttle_lag:
+            keep = self.__get_option("throttle_keep_severity", DEFAULT_THROTTLE_KEEP_SEVERITY)
+            self.throttle = AdaptiveThrottle(
+                self.hass.loop,
+                rate_budget=throttle_rate,
+                lag_budget=throttle_lag / 1000,
+                keep_level=MIN_SEVERITY_LEVELS.get(keep, MIN_SEVERITY_LEVELS[DEFAULT_THROTTLE_KEEP_SEVERITY]),
+                min_level=self._pipeline.min_level,
+            )
+        window = self.__get_option("dedup_window", DEFAULT_DEDUP_WINDOW)
+        if window:
+            self.dedup = Deduplicator(
+                self.hass.loop, window, self.__get_option("dedup_size", DEFAULT_DEDUP_SIZE), self._fire
+            )
+        rate = self.__get_option("rate_limit", DEFAULT_RATE_LIMIT)
+        if rate:
+            self.rate_limiter = RateLimiter(rate, self.__get_option("rate_burst", DEFAULT_RATE_BURST))
+        if self.__get_option("batch_events", DEFAULT_BATCH_EVENTS):
+            self.batcher = BatchDispatcher(
+                self.hass,
+                interval_ms=self.__get_option("batch_interval", DEFAULT_BATCH_INTERVAL),
+                batch_size=self.__get_option("batch_size", DEFAULT_BATCH_SIZE),
+                queue_size=self.__get_option("queue_size", DEFAULT_QUEUE_SIZE),
+                overflow=self.__get_option("overflow_policy", DEFAULT_OVERFLOW_POLICY),
+            )
+
+    async def _load_ssl_context(self):
+        """Load the certificate of the TLS listeners, off the event loop."""
+        if not any(listener.scheme == "tls" for listener in self.listeners):
+            return
+        try:
+            self.ssl_context = await self.hass.async_add_executor_job(
+                _create_ssl_context, self.__get_option("certfile"), self.__get_option("keyfile")
             )
-            raise ValueError(f"Invalid IPv6 link-local address '{host}' without scope")
-
-        # Handle UDP sockets
-        if proto == "udp":
-            _LOGGER.debug(f"getaddrinfo host={host} port={port} config={self.config} options={self.options}")
-            infos = socket.getaddrinfo(
-                host if len(host) else None, port, # host=None allow both V4 and V6
-                family=socket.AF_UNSPEC,
-                type=socket.SOCK_DGRAM,
-                proto=0,
-                flags=socket.AI_PASSIVE
+        except (OSError, ssl.SSLError) as ex:
+            _LOGGER.error("Failed to load TLS cert/key: %s", ex)
+            raise
+
+    def _start_workers(self, loop):
+        """Create the worker pool if worker_mode asks for one."""
+        if self.__get_option("worker_mode", DEFAULT_WORKER_MODE) == "process":
+            # Imported on demand, like the archive and the forwarder: most
+            # instances use none of them and they are not free to import
+            from .workers import WorkerPool
+
+            count = self.__get_option("worker_count", DEFAULT_WORKER_COUNT)
+            self.workers = WorkerPool(loop, count, self._pipeline, self._deliver_batch)
+            _LOGGER.debug("Started %s worker process(es)", count)
+
+    async def _open_store(self):
+        """Open the message archive if it is enabled."""
+        if self.storage_dir and self.__get_option("archive", DEFAULT_ARCHIVE):
+            from .storage import MessageStore
+
+            size = self.__get_option("archive_size", DEFAULT_ARCHIVE_SIZE) * 1024 * 1024
+            store = MessageStore(self.hass, self.storage_dir, size)
+            await self.hass.async_add_executor_job(store.open)
+            self.store = store
+            _LOGGER.debug("Opened message archive in %s (%s bytes)", self.storage_dir, size)
+
+    def _start_forwarder(self):
+        """Start relaying messages if a forward target is set."""
+        target = self.__get_option("forward_target", DEFAULT_FORWARD_TARGET)
+        if not target:
+            return
+        from .forwarder import create_forwarder
+
+        try:
+            forwarder = create_forwarder(
+                self.hass,
+                target,
+                self.__get_option("forward_queue_size", DEFAULT_FORWARD_QUEUE_SIZE),
+                self.__get_option("forward_file_size", DEFAULT_FORWARD_FILE_SIZE) * 1024 * 1024,
             )
-            if not infos:
-                _LOGGER.error("getaddrinfo() returned no results for UDP bind: host=%s port=%s", host, port)
-                raise ValueError(f"Cannot bind UDP: no usable address found for host={host} port={port}")
-            _LOGGER.debug(f"infos={infos}")
-            bound = False  # Track if any socket successfully bound
-
-            for af, socktype, proto_num, _, sockaddr in infos:
-                _LOGGER.debug(f" af={af} socktype={socktype} proto_num={proto_num}")
+        except ValueError as ex:
+            _LOGGER.error("Not forwarding messages: %s", ex)
+            return
+        forwarder.start()
+        self.forwarder = forwarder
+        self.forward_all = self.__get_option("forward_scope", DEFAULT_FORWARD_SCOPE) == "all"
+        _LOGGER.debug("Forwarding %s messages to %s", "all" if self.forward_all else "accepted", target)
+
+    @property
+    def dropped_backlog(self) -> int:
+        """Messages shed because the worker pool fell behind."""
+        return self.workers.dropped if self.workers else 0
+
+    @property
+    def dropped_throttled(self) -> int:
+        """Messages shed by adaptive throttling."""
+        return self.throttle.dropped if self.throttle else 0
+
+    @property
+    def duplicates(self) -> int:
+        """Messages folded into a repeat_count event by duplicate suppression."""
+        return self.dedup.suppressed if self.dedup else 0
+
+    @property
+    def dropped_rate_limited(self) -> int:
+        """Messages shed by the per-source rate limiter."""
+        return self.rate_limiter.dropped if self.rate_limiter else 0
+
+    @property
+    def dropped_overflow(self) -> int:
+        """Messages shed because the batch queue was full."""
+        return self.batcher.dropped if self.batcher else 0
+
+    def get_stats(self) -> dict:
+        """Snapshot of all receiver counters, for diagnostic sensors and diagnostics.
+
+        Reads the kernel UDP tables, so it must run in an executor.
+        """
+        data = self.stats.as_dict()
+        data["duplicates"] = self.duplicates
+        data["dropped_throttled"] = self.dropped_throttled
+        data["dropped_rate_limited"] = self.dropped_rate_limited
+        data["dropped_overflow"] = self.dropped_overflow
+        data["dropped_backlog"] = self.dropped_backlog
+        data["dropped"] = (
+            data["dropped_source"] + data["dropped_severity"] + data["dropped_throttled"] + data["dropped_rule"]
+            + data["dropped_rate_limited"]
+            + data["dropped_overflow"] + data["dropped_backlog"]
+        )
+        data["tcp_connections"] = self.tcp_connections
+        data["tcp_sources"] = len(self.tcp_sources)
+        data["tcp_rejected"] = self.tcp_rejected
+        data["tcp_rejected_source"] = self.tcp_rejected_source
+        data["tcp_rejected_ip"] = self.tcp_rejected_ip
+        data["tcp_idle_timeouts"] = self.tcp_idle_timeouts
+        data["tcp_read_timeouts"] = self.tcp_read_timeouts
+        data["tcp_truncated"] = self.tcp_truncated
+        data["tls_handshakes"] = self.tls_handshakes
+        data["tls_rejected"] = self.tls_rejected
+        data["tls_failed"] = self.tls_failed
+        data["udp_sockets"] = len(self.transports)
+        readers = [t for t in self.transports if isinstance(t, SyslogUDPBatchReader)]
+        data["udp_batch_size"] = (
+            round(sum(r.datagrams for r in readers) / max(sum(r.batches for r in readers), 1), 1)
+            if readers else None
+        )
+        data["udp_rcvbuf"] = self.udp_rcvbuf
+        data["udp_kernel_drops"] = read_udp_drops(self._udp_inodes)
+        throttle = self.throttle
+        data["throttle_threshold"] = severity_name(throttle.full_level) if throttle else None
+        data["throttle_sample_rate"] = throttle.fraction if throttle else None
+        data["throttle_sampled_severity"] = severity_name(throttle.sampled_level) if throttle else None
+        data["throttle_step"] = throttle.step if throttle else None
+        data["throttle_message_rate"] = round(throttle.message_rate, 1) if throttle else None
+        data["throttle_loop_lag_ms"] = round(throttle.loop_lag * 1000, 1) if throttle else None
+        data["archive_written"] = self.store.written if self.store else None
+        data["archive_dropped"] = self.store.dropped if self.store else None
+        forwarder = self.forwarder
+        data["forwarded"] = forwarder.forwarded if forwarder else None
+        data["forward_queue"] = forwarder.pending if forwarder else None
+        data["forward_dropped"] = forwarder.dropped if forwarder else None
+        data["forward_errors"] = forwarder.errors if forwarder else None
+        data["forward_connected"] = forwarder.connected if forwarder else None
+        return data
+
+    def update_options(self, options):
+        """Apply new options and recompile the filter pipeline."""
+        self.options = options
+        self._pipeline = self._compile_pipeline()
+        if self.throttle is not None:
+            self.throttle.set_min_level(self._pipeline.min_level)
+        if self.workers is not None:
+            self.workers.set_pipeline(self._pipeline)
+
+    def _listeners(self):
+        """Listeners of this entry: the listeners option, or the single host/port/protocol one."""
+        raw = self.__get_option("listeners", DEFAULT_LISTENERS)
+        if raw:
+            listeners, invalid = parse_listeners(raw)
+            for item in invalid:
+                _LOGGER.warning("Ignoring invalid listener '%s'", item)
+            if listeners:
+                return listeners
+        return [legacy_listener(
+            self.__get_option("protocol", ""),
+            self.__get_option("host", ""),
+            self.__get_option("port", ""),
+            self.__get_option("use_tls"),
+        )]
+
+    def needs_restart(self, options) -> bool:
+        """Whether applying options requires closing and rebinding the listeners."""
+        keys = (set(self.config) | set(self.options) | set(options)) - LIVE_OPTIONS
+        return any(options.get(key, self.config.get(key)) != self.__get_option(key) for key in keys)
+
+    async def async_update_options(self, options):
+        """Apply options that do not affect the listeners while every socket stays open."""
+        if self.ssl_context is not None:
+            # Reload even when the paths are unchanged: renewals rewrite the same files
+            certfile = options.get("certfile", self.config.get("certfile"))
+            keyfile = options.get("keyfile", self.config.get("keyfile"))
+            try:
+                # Load the pair into a new context so a bad file cannot break the live one
+                context = await self.hass.async_add_executor_job(_create_ssl_context, certfile, keyfile)
+            except (OSError, ssl.SSLError) as ex:
+                _LOGGER.error("Failed to load TLS cert/key, keeping the current one: %s", ex)
+            else:
+                # New handshakes pick up the new context; sessions already
+                # established keep the certificate they started with
+                self.ssl_context = context
+                _LOGGER.info("Reloaded TLS certificate %s for new connections", certfile)
+
+        self.update_options(options)
+        interval = self.__get_option("sensor_update_interval", DEFAULT_SENSOR_UPDATE_INTERVAL)
+        for sensor in self.sensors:
+            sensor.update_interval = interval
+
+    async def start(self):
+        """Start every listener of the entry; all of them feed the same pipeline."""
+        loop = asyncio.get_running_loop()
+        try:
+            self.listeners = self._listeners()
+            await self._load_ssl_context()
+            for listener in self.listeners:
+                host = listener.host
+                # Check for malformed IPv6 link-local addresses (scope required)
+                if host.startswith("fe80::") and "%" not in host:
+                    _LOGGER.error(
+                        "Link-local IPv6 address '%s' is missing a required interface scope (e.g. %%eth0). "
+                        "Binding will fail without this. Please update your host value.",
+                        host
+                    )
+                    raise ValueError(f"Invalid IPv6 link-local address '{host}' without scope")
+
+                if listener.scheme == "udp":
+                    await self._start_udp(loop, host, listener.port)
+                else:
+                    await self._start_tcp(loop, host, listener.port, listener.scheme == "tls")
+
+            await self._open_store()
+            self._start_forwarder()
+            if self.throttle is not None:
+                self.throttle.start()
+            self._start_workers(loop)
+        except Exception:
+            # Do not leave the listeners that did bind open
+            await self.stop()
+            raise
+
+    async def _start_udp(self, loop, host: str, port: int):
+        """Bind the UDP sockets of one listener."""
+        _LOGGER.debug(f"getaddrinfo host={host} port={port} config={self.config} options={self.options}")
+        # Resolved by the loop in an executor: a host name lookup must not block it
+        infos = await loop.getaddrinfo(
+            host if len(host) else None, port, # host=None allow both V4 and V6
+            family=socket.AF_UNSPEC,
+            type=socket.SOCK_DGRAM,
+            proto=0,
+            flags=socket.AI_PASSIVE
+        )
+        if not infos:
+            _LOGGER.error("getaddrinfo() returned no results for UDP bind: host=%s port=%s", host, port)
+            raise ValueError(f"Cannot bind UDP: no usable address found for host={host} port={port}")
+        _LOGGER.debug(f"infos={infos}")
+        bound = False  # Track if any socket successfully bound
+        # Several sockets per address let the kernel hash flows across them (SO_REUSEPORT)
+        count = max(int(self.__get_option("udp_sockets", DEFAULT_UDP_SOCKETS)), 1)
+        rcvbuf = self.__get_option("udp_rcvbuf", DEFAULT_UDP_RCVBUF)
+        engine = self.__get_option("udp_engine", DEFAULT_UDP_ENGINE)
+
+        for af, socktype, proto_num, _, sockaddr in infos:
+            _LOGGER.debug(f" af={af} socktype={socktype} proto_num={proto_num}")
+            for index in range(count):
+                sock = None
                 try:
                     sock = socket.socket(af, socktype, proto_num)
                     sock.setblocking(False)
                     sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
                     try:
                         sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
-                    except OSError:
+                    except (AttributeError, OSError):
                         _LOGGER.debug("SO_REUSEPORT not available on this platform")
+                    if rcvbuf:
+                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, rcvbuf)
                     # Enable dual-stack mode if IPv6 (accepts both v6 and v4 on same port)
                     if af == socket.AF_INET6 and hasattr(socket, "IPV6_V6ONLY"):
                         sock.setsockopt(socket.IPPROTO_IPV6, socket.IPV6_V6ONLY, 0)
                     sock.bind(sockaddr)
 
-                    transport, _ = await loop.create_datagram_endpoint(
-                        lambda: SyslogUDPProtocol(self),
-                        sock=sock
-                    )
+                    transport = None
+                    if engine == "batch":
+                        try:
+                            transport = SyslogUDPBatchReader(loop, sock, self)
+                        except NotImplementedError:
+                            _LOGGER.warning("The batch UDP engine needs a selector event loop, using the default engine")
+                            engine = "protocol"
+                    if transport is None:
+                        transport, _ = await loop.create_datagram_endpoint(
+                            lambda: SyslogUDPProtocol(self),
+                            sock=sock
+                        )
                     self.transports.append(transport)
-                    _LOGGER.debug("Started UDP endpoint on %s [%s]", sockaddr, af)
+                    self.udp_rcvbuf = sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF)
+                    self._udp_inodes.add(os.fstat(sock.fileno()).st_ino)
+                    _LOGGER.debug(
+                        "Started UDP endpoint %s/%s on %s [%s], receive buffer %s bytes, %s engine",
+                        index + 1, count, sockaddr, af, self.udp_rcvbuf, engine,
+                    )
                     bound = True
 
                 except Exception as ex:
-                    _LOGGER.warning("Could not bind UDP %s: %s", sockaddr, ex)
-                    try:
-                        sock.close()
-                    except Exception:
-                        pass
+                    _LOGGER.warning("Could not bind UDP %s (socket %s/%s): %s", sockaddr, index + 1, count, ex)
+                    if sock is not None:
+                        try:
+                            sock.close()
+                        except Exception:
+                            pass
                     continue
 
-            if not bound:
-                _LOGGER.error("Failed to bind any UDP socket on host=%s port=%s", host, port)
-                raise ValueError(f"UDP socket binding failed on {host}:{port}")
-
-        # Handle TCP (plain or TLS)
-        elif proto in ("tcp", "tcp+tls"):
-            _LOGGER.debug(f"getaddrinfo host={host} port={port} config={self.config} options={self.options}")
-            infos = socket.getaddrinfo(
-                host, port,
-                family=socket.AF_UNSPEC,
-                type=socket.SOCK_STREAM,
-                proto=0,
-                flags=socket.AI_PASSIVE
-            )
-            if not infos:
-                _LOGGER.error("getaddrinfo() returned no results for TCP bind: host=%s port=%s", host, port)
-                raise ValueError(f"Cannot bind TCP: no usable address found for host={host} port={port}")
-            _LOGGER.debug(f"infos={infos}")
-            bound = False
-
-            for af, socktype, proto_num, _, sockaddr in infos:
-                _LOGGER.debug(f" af={af} socktype={socktype} proto_num={proto_num}")
+        if not bound:
+            _LOGGER.error("Failed to bind any UDP socket on host=%s port=%s", host, port)
+            raise ValueError(f"UDP socket binding failed on {host}:{port}")
+
+    async def _start_tcp(self, loop, host: str, port: int, tls: bool):
+        """Bind the TCP (or TLS) server sockets of one listener."""
+        _LOGGER.debug(f"getaddrinfo host={host} port={port} config={self.config} options={self.options}")
+        infos = await loop.getaddrinfo(
+            host if len(host) else None, port,
+            family=socket.AF_UNSPEC,
+            type=socket.SOCK_STREAM,
+            proto=0,
+            flags=socket.AI_PASSIVE
+        )
+        if not infos:
+            _LOGGER.error("getaddrinfo() returned no results for TCP bind: host=%s port=%s", host, port)
+            raise ValueError(f"Cannot bind TCP: no usable address found for host={host} port={port}")
+        _LOGGER.debug(f"infos={infos}")
+        bound = False
+        # TLS is started by handle_tcp once the connection limits have been checked
+        handler = self.handle_tls if tls else self.handle_tcp
+
+        for af, socktype, proto_num, _, sockaddr in infos:
+            _LOGGER.debug(f" af={af} socktype={socktype} proto_num={proto_num}")
+            sock = None
+            try:
+                sock = socket.socket(af, socktype, proto_num)
+                sock.setblocking(False)
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
                 try:
-                    sock = socket.socket(af, socktype, proto_num)
-                    sock.setblocking(False)
-                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-                    try:
-                        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
-                    except OSError:
-                        _LOGGER.debug("SO_REUSEPORT not available on this platform")
-                    sock.bind(sockaddr)
+                    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+                except OSError:
+                    _LOGGER.debug("SO_REUSEPORT not available on this platform")
+                sock.bind(sockaddr)
 
-                    use_ssl = self.ssl_context if self.__get_option("use_tls") else None
-                    server = await asyncio.start_server(
-                        self.handle_tcp,
-                        sock=sock,
-                        ssl=use_ssl
-                    )
-                    self.servers.append(server)
-                    _LOGGER.debug(
-                        "Started TCP%s endpoint on %s [%s]",
-                        " +TLS" if use_ssl else "",
-                        sockaddr,
-                        af,
-                    )
-                    bound = True
+                server = await asyncio.start_server(handler, sock=sock)
+                self.servers.append(server)
+                _LOGGER.debug(
+                    "Started TCP%s endpoint on %s [%s]",
+                    " +TLS" if tls else "",
+                    sockaddr,
+                    af,
+                )
+                bound = True
 
-                except ssl.SSLError as ex:
-                    _LOGGER.error("TLS handshake setup failed on %s: %s", sockaddr, ex)
-                    raise
-                except Exception as ex:
-                    _LOGGER.warning("Could not bind TCP %s: %s", sockaddr, ex)
+            except Exception as ex:
+                _LOGGER.warning("Could not bind TCP %s: %s", sockaddr, ex)
+                if sock is not None:
                     try:
                         sock.close()
                     except Exception:
                         pass
-                    continue
+                continue
 
-            if not bound:
-                _LOGGER.error("Failed to bind any TCP socket on host=%s port=%s", host, port)
-                raise ValueError(f"TCP socket binding failed on {host}:{port}")
-
-        else:
-            raise ValueError(f"Unsupported protocol: {proto}")
+        if not bound:
+            _LOGGER.error("Failed to bind any TCP socket on host=%s port=%s", host, port)
+            raise ValueError(f"TCP socket binding failed on {host}:{port}")
 
     async def stop(self):
         """Stop all listeners and clean up sockets."""
+        if self.workers is not None:
+            self.workers.close()
+            self.workers = None
+
+        if self.throttle is not None:
+            self.throttle.close()
+
+        # Report repeats still held back, then fire whatever is waiting in the batch queue
+        if self.dedup is not None:
+            self.dedup.close()
+        if self.batcher is not None:
+            self.batcher.close()
+
+        if self.store is not None:
+            await self.store.async_close()
+            self.store = None
+
+        if self.forwarder is not None:
+            await self.forwarder.async_close()
+            self.forwarder = None
+
         # UDP transports
         for transport in self.transports:
             transport.close()
         self.transports.clear()
+        self._udp_inodes.clear()
 
         # TCP servers
         for server in self.servers:
@@ -184,62 +602,221 @@ class SyslogServer:
 
     def process_message(self, data: bytes, addr):
         """Handle a received syslog packet: decode, filter, store, and fire an HA event."""
-        encoding = self.__get_option("encoding", None)
-        try:
-            if encoding:
-                message = data.decode(encoding, errors="replace").strip()
-            else:
-                message = data.decode(errors="replace").strip()
-        except LookupError:
-            _LOGGER.error("Invalid encoding '%s'. Falling back to default.", encoding)
-            message = data.decode(errors="replace").strip()
         src_ip = addr[0]
 
         # Filter by allowed IPs
-        raw_ips = self.__get_option("allowed_ips", "")
-        ips = [ip.strip() for ip in raw_ips.split(",") if ip.strip()]
-        if ips and src_ip not in ips:
-            _LOGGER.debug(f"Ignoring message from {src_ip}")
+        if not self._pipeline.is_allowed(src_ip):
+            _LOGGER.debug("Ignoring message from %s", src_ip)
+            stats = self.stats
+            stats.received += 1
+            stats.bytes_received += len(data)
+            stats.dropped_source += 1
             return
 
-        # Parse syslog priority header (e.g., <14>) and extract severity
-        m = re.match(r"<(\d+)>(.*)", message)
-        if m:
-            pri = int(m.group(1))
-            severity = pri & 0x07
-            min_level = MIN_SEVERITY_LEVELS.get(self.__get_option("min_severity", "info"), 6)
-            if severity > min_level:
+        self._handle_message(data, src_ip)
+
+    def _handle_message(self, data: bytes, src_ip: str):
+        """Process a message from a source that already passed the allowed IPs filter."""
+        stats = self.stats
+        stats.received += 1
+        stats.bytes_received += len(data)
+        if self.forward_all:
+            # Relay the raw message; bytes() copies TCP frames and batch engine slices
+            self.forwarder.add(bytes(data).rstrip(b"\r\n"))
+        workers = self.workers
+        if workers is not None:
+            # Drop on the raw header before copying and shipping the message to a worker
+            if self._pipeline.below_min_severity(data):
+                stats.dropped_severity += 1
+                return
+            # bytes() copies TCP memoryview frames; UDP datagrams are passed as they are
+            workers.submit(bytes(data), src_ip)
+            return
+        start = perf_counter_ns()
+        self._process_allowed(data, src_ip)
+        stats.observe(perf_counter_ns() - start)
+
+    def _process_allowed(self, data: bytes, src_ip: str):
+        """Decode, filter and dispatch one message."""
+        self._deliver(self._pipeline.prepare(data, src_ip))
+
+    def _deliver_batch(self, results):
+        """Dispatch a batch prepared by the worker pool, in order."""
+        observe = self.stats.observe
+        deliver = self._deliver
+        for event_data, elapsed in results:
+            observe(elapsed)
+            deliver(event_data)
+
+    def _deliver(self, event_data):
+        """Account for a prepared message and dispatch it; runs on the event loop."""
+        stats = self.stats
+        if event_data is None:
+            stats.dropped_severity += 1
+            return
+        if "\ufffd" in event_data["message"]:
+            stats.decode_errors += 1
+
+        # Under overload, shed low-severity messages before they cost anything more
+        throttle = self.throttle
+        if throttle is not None and not throttle.allow(event_data["severity"], event_data["source_ip"]):
+            return
+
+        # Routing rules pick the event type, or drop the message before anything else sees it
+        event_type = EVENT_MESSAGE
+        rules = self._pipeline.rules
+        if rules:
+            event_type = rules.route(event_data)
+            if event_type is None:
+                stats.dropped_rule += 1
                 return
-            body = m.group(2).strip()
-        else:
-            severity = None
-            body = message
+
+        # Copies of a message seen within the dedup window are only counted
+        dedup = self.dedup
+        if dedup is not None and dedup.seen(event_type, event_data):
+            return
+
+        # Shed chatty sources before they reach the event bus
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None and not rate_limiter.allow(event_data["source_ip"]):
+            return
+
+        self._fire(event_type, event_data)
+
+    def _fire(self, event_type: str, event_data: dict):
+        """Count an accepted message and hand it to the event bus, the archive and the sensors."""
+        stats = self.stats
+        src_ip = event_data["source_ip"]
+        severity = event_data["severity"]
+        stats.accepted += 1
+        stats.sources.add(src_ip)
+        if severity is not None:
+            stats.severity[severity] += 1
 
         # Store last message for optional sensor
-        self.last_message = body
+        self.last_message = event_data["message"]
         self.last_source = src_ip
         self.last_severity = severity
 
-        # Fire event on Home Assistant event bus
-        event_data = {"message": body, "source_ip": src_ip, "severity": severity}
-        self.hass.bus.async_fire(f"{DOMAIN}_message", event_data)
-        _LOGGER.info("Received %s", event_data)
+        # Fire event on Home Assistant event bus, directly or as part of a batch.
+        # Routed messages always get their own event.
+        if self.batcher is not None and event_type == EVENT_MESSAGE:
+            self.batcher.add(event_data)
+        else:
+            self.hass.bus.async_fire(event_type, event_data)
+        _LOGGER.debug("Received %s", event_data)
+
+        if self.store is not None:
+            self.store.add(event_data)
+
+        forwarder = self.forwarder
+        if forwarder is not None and not self.forward_all:
+            forwarder.add_event(event_data)
 
-        # Notify all registered sensors to update their state with the latest message
+        # Notify all registered sensors; they coalesce state writes themselves
         for sensor in self.sensors:
-            sensor.async_schedule_update_ha_state()
+            sensor.async_message_received()
 
-    async def handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
-        """Handle a TCP client: receive lines and pass to process_message()."""
+    async def handle_tls(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Handle a TLS client: like handle_tcp, with the handshake after the connection limits."""
+        await self.handle_tcp(reader, writer, tls=True)
+
+    async def handle_tcp(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter, tls: bool = False):
+        """Handle a TCP client: read the stream in large chunks and process every frame in it."""
         addr = writer.get_extra_info("peername")
+        src_ip = addr[0]
+        max_connections = self.__get_option("max_connections", DEFAULT_MAX_CONNECTIONS)
+        if max_connections and self.tcp_connections >= max_connections:
+            self.tcp_rejected += 1
+            _LOGGER.warning("Rejecting TCP connection from %s: %s connections already open", addr, self.tcp_connections)
+            await _close_writer(writer)
+            return
+        per_source = self.__get_option("max_connections_per_source", DEFAULT_MAX_CONNECTIONS_PER_SOURCE)
+        sources = self.tcp_sources
+        if per_source and sources.get(src_ip, 0) >= per_source:
+            self.tcp_rejected_source += 1
+            _LOGGER.debug("Rejecting TCP connection from %s: %s connections already open from it", addr, per_source)
+            await _close_writer(writer)
+            return
+
+        self.tcp_connections += 1
+        sources[src_ip] = sources.get(src_ip, 0) + 1
+        decoder = FrameDecoder(self.__get_option("max_frame_size", DEFAULT_MAX_FRAME_SIZE))
         try:
-            while data := await reader.readline():
-                self.process_message(data, addr)
+            # Reject the peer once at accept time instead of on every line
+            if not self._pipeline.is_allowed(src_ip):
+                _LOGGER.debug("Rejecting TCP connection from %s", src_ip)
+                self.tcp_rejected_ip += 1
+                return
+            read_timeout = self.__get_option("read_timeout", DEFAULT_READ_TIMEOUT) or None
+            if tls and not await self._start_tls(writer, addr, read_timeout):
+                return
+
+            idle_timeout = self.__get_option("idle_timeout", DEFAULT_IDLE_TIMEOUT) or None
+            handle = self._handle_message
+            pipeline = self._pipeline
+            while True:
+                # A started message must be finished within read_timeout, otherwise
+                # the peer may stay silent for idle_timeout
+                partial_frame = decoder.pending
+                try:
+                    chunk = await asyncio.wait_for(
+                        reader.read(TCP_READ_SIZE), read_timeout if partial_frame else idle_timeout
+                    )
+                except asyncio.TimeoutError:
+                    if partial_frame:
+                        self.tcp_read_timeouts += 1
+                        _LOGGER.debug("Closing TCP connection from %s: message not finished in time", addr)
+                    else:
+                        self.tcp_idle_timeouts += 1
+                        _LOGGER.debug("Closing idle TCP connection from %s", addr)
+                    break
+                if not chunk:
+                    for frame in decoder.flush():
+                        handle(frame, src_ip)
+                    break
+                if self._pipeline is not pipeline:
+                    # Options changed during the session: check the peer against the new list
+                    pipeline = self._pipeline
+                    if not pipeline.is_allowed(src_ip):
+                        _LOGGER.debug("Closing TCP connection from %s, no longer allowed", src_ip)
+                        self.tcp_rejected_ip += 1
+                        break
+                for frame in decoder.feed(chunk):
+                    handle(frame, src_ip)
+        except (ConnectionError, ssl.SSLError) as ex:
+            _LOGGER.debug("TCP connection from %s lost: %s", addr, ex)
         except Exception:
             _LOGGER.exception("TCP error from %s", addr)
         finally:
-            writer.close()
-            await writer.wait_closed()
+            self.tcp_connections -= 1
+            if sources[src_ip] > 1:
+                sources[src_ip] -= 1
+            else:
+                del sources[src_ip]
+            self.tcp_truncated += decoder.truncated
+            await _close_writer(writer)
+
+    async def _start_tls(self, writer: asyncio.StreamWriter, addr, timeout) -> bool:
+        """Run the TLS handshake of a session, within the handshake limits. Returns False if it failed."""
+        max_handshakes = self.__get_option("max_tls_handshakes", DEFAULT_MAX_TLS_HANDSHAKES)
+        if max_handshakes and self.tls_handshakes >= max_handshakes:
+            self.tls_rejected += 1
+            _LOGGER.debug("Rejecting TLS connection from %s: %s handshakes in progress", addr, self.tls_handshakes)
+            return False
+        self.tls_handshakes += 1
+        try:
+            # Uses the context as it is now, so a reloaded certificate applies to this
+            # session. Nothing may be awaited before this: the ClientHello must reach
+            # the TLS layer, not the plain stream reader.
+            await writer.start_tls(self.ssl_context, ssl_handshake_timeout=timeout)
+            return True
+        except OSError as ex:
+            self.tls_failed += 1
+            _LOGGER.debug("TLS handshake with %s failed: %s", addr, ex)
+            return False
+        finally:
+            self.tls_handshakes -= 1
 
 class SyslogUDPProtocol(asyncio.DatagramProtocol):
     """UDP protocol implementation for asyncio loop."""
@@ -253,4 +830,63 @@ class SyslogUDPProtocol(asyncio.DatagramProtocol):
 
     def datagram_received(self, data: bytes, addr):
         """Handle each UDP packet received and pass to server logic."""
-        self.server.process_message(data, addr)
\ No newline at end of file
+        self.server.process_message(data, addr)
+
+class SyslogUDPBatchReader:
+    """UDP receive engine that drains a socket in batches into a reusable buffer.
+
+    The default engine (SyslogUDPProtocol) gets one new bytes object per
+    datagram and goes through the transport machinery of asyncio for each of
+    them. This one registers the socket with loop.add_reader() and, on every
+    wakeup, reads up to UDP_BATCH datagrams with recvfrom_into() back to back
+    into one preallocated buffer, then hands the batch to the server as
+    memoryview slices of that buffer. No per-datagram allocation besides the
+    slice is made; a slice is only valid during the process_message() call.
+
+    Python has no recvmmsg(), so it is still one syscall per datagram, but
+    without a selector round trip in between. Has the close() of a transport
+    so the server can treat it like one.
+    """
+
+    def __init__(self, loop, sock: socket.socket, server: SyslogServer):
+        self.loop = loop
+        self.sock = sock
+        self.server = server
+        self._view = memoryview(bytearray(UDP_ARENA_SIZE))
+        self._batch = []
+        self.batches = 0
+        self.datagrams = 0
+        loop.add_reader(sock.fileno(), self._read_ready)
+
+    def _read_ready(self):
+        view = self._view
+        batch = self._batch
+        recv_into = self.sock.recvfrom_into
+        limit = UDP_ARENA_SIZE - UDP_MAX_DATAGRAM  # room for one more full-size datagram
+        offset = 0
+        while len(batch) < UDP_BATCH and offset <= limit:
+            try:
+                nbytes, addr = recv_into(view[offset:], UDP_MAX_DATAGRAM)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as ex:
+                _LOGGER.debug("UDP receive error: %s", ex)
+                break
+            batch.append((offset, offset + nbytes, addr))
+            offset += nbytes
+
+        if not batch:
+            return
+        self.batches += 1
+        self.datagrams += len(batch)
+        process = self.server.process_message
+        try:
+            for start, stop, addr in batch:
+                process(view[start:stop], addr)
+        finally:
+            batch.clear()
+
+    def close(self):
+        if self.sock.fileno() >= 0:
+            self.loop.remove_reader(self.sock.fileno())
+            self.sock.close()
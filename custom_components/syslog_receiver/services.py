@@ -0,0 +1,73 @@
+from functools import partial
+import voluptuous as vol
+from homeassistant.core import HomeAssistant, ServiceCall, ServiceResponse, SupportsResponse
+from homeassistant.exceptions import ServiceValidationError
+from homeassistant.helpers import config_validation as cv
+from homeassistant.util import dt as dt_util
+from .const import DOMAIN, MIN_SEVERITY_LEVELS, SERVICE_QUERY
+
+QUERY_SCHEMA = vol.Schema(
+    {
+        vol.Optional("entry_id"): cv.string,
+        vol.Optional("start"): cv.datetime,
+        vol.Optional("end"): cv.datetime,
+        vol.Optional("source"): cv.string,
+        vol.Optional("severity"): vol.In(tuple(MIN_SEVERITY_LEVELS.keys())),
+        vol.Optional("contains"): cv.string,
+        vol.Optional("limit", default=100): vol.All(vol.Coerce(int), vol.Range(min=1, max=10000)),
+    }
+)
+
+
+def _timestamp(value):
+    """Convert a service datetime (naive means HA local time) to a POSIX timestamp."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=dt_util.get_default_time_zone())
+    return value.timestamp()
+
+
+async def _async_query(hass: HomeAssistant, call: ServiceCall) -> ServiceResponse:
+    """Search the message archive of one or all receiver instances."""
+    servers = hass.data.get(DOMAIN, {})
+    entry_id = call.data.get("entry_id")
+    if entry_id is not None:
+        if entry_id not in servers:
+            raise ServiceValidationError(f"No syslog receiver with entry_id {entry_id}")
+        servers = {entry_id: servers[entry_id]}
+    stores = [(eid, server.store) for eid, server in servers.items() if server.store is not None]
+    if not stores:
+        raise ServiceValidationError("The message archive is not enabled on any syslog receiver")
+
+    severity = call.data.get("severity")
+    limit = call.data["limit"]
+    query = {
+        "start": _timestamp(call.data.get("start")),
+        "end": _timestamp(call.data.get("end")),
+        "source": call.data.get("source"),
+        "max_severity": MIN_SEVERITY_LEVELS[severity] if severity else None,
+        "contains": call.data.get("contains"),
+        "limit": limit,
+    }
+    messages = []
+    for eid, store in stores:
+        for record in await hass.async_add_executor_job(partial(store.query, **query)):
+            record["entry_id"] = eid
+            messages.append(record)
+    messages.sort(key=lambda record: record["received"])
+    messages = messages[-limit:]
+    for record in messages:
+        record["received"] = dt_util.utc_from_timestamp(record["received"]).isoformat()
+    return {"messages": messages}
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the integration services."""
+
+    async def async_query(call: ServiceCall) -> ServiceResponse:
+        return await _async_query(hass, call)
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_QUERY, async_query, schema=QUERY_SCHEMA, supports_response=SupportsResponse.ONLY
+    )
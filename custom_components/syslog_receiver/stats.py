@@ -0,0 +1,98 @@
+import time
+from bisect import bisect_left
+from .const import MIN_SEVERITY_LEVELS
+
+# Upper bounds of the processing time histogram buckets, in microseconds
+LATENCY_BUCKETS_US = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Number of sources tracked individually
+TOP_SOURCES = 32
+
+
+class TopSources:
+    """Approximate per-source message counts in bounded memory (Space-Saving).
+
+    At most `capacity` sources are tracked. A new source replaces the one with
+    the lowest count and inherits that count, so heavy senders are always kept
+    and their counts are overestimated by at most the count of the evicted entry.
+    """
+
+    __slots__ = ("capacity", "counts")
+
+    def __init__(self, capacity: int = TOP_SOURCES):
+        self.capacity = capacity
+        self.counts = {}
+
+    def add(self, src_ip: str):
+        counts = self.counts
+        count = counts.get(src_ip)
+        if count is not None:
+            counts[src_ip] = count + 1
+        elif len(counts) < self.capacity:
+            counts[src_ip] = 1
+        else:
+            victim = min(counts, key=counts.__getitem__)
+            counts[src_ip] = counts.pop(victim) + 1
+
+    def top(self, n: int = 10):
+        """Return the n busiest sources as [(source, count)], busiest first."""
+        return sorted(self.counts.items(), key=lambda item: item[1], reverse=True)[:n]
+
+
+class ReceiverStats:
+    """Low-overhead counters of one syslog receiver instance.
+
+    Plain integer attributes are incremented inline on the receive path; the
+    processing time of every message goes into a fixed-bucket histogram.
+    """
+
+    def __init__(self):
+        self.started = time.time()
+        self.received = 0
+        self.bytes_received = 0
+        self.accepted = 0
+        self.dropped_source = 0
+        self.dropped_severity = 0
+        self.dropped_rule = 0
+        self.decode_errors = 0
+        self.severity = [0] * 8
+        self.latency = [0] * (len(LATENCY_BUCKETS_US) + 1)
+        self.sources = TopSources()
+        self._bounds_ns = tuple(bound * 1000 for bound in LATENCY_BUCKETS_US)
+
+    def observe(self, elapsed_ns: int):
+        """Record the processing time of one message."""
+        self.latency[bisect_left(self._bounds_ns, elapsed_ns)] += 1
+
+    def percentile(self, q: float):
+        """Return the upper bucket bound (µs) below which a fraction q of messages finished."""
+        total = sum(self.latency)
+        if not total:
+            return None
+        target = q * total
+        seen = 0
+        for bound, count in zip(LATENCY_BUCKETS_US, self.latency):
+            seen += count
+            if seen >= target:
+                return bound
+        return None  # slower than the last bucket
+
+    def as_dict(self) -> dict:
+        """Snapshot of all counters, for sensors and diagnostics."""
+        histogram = {f"le_{bound}us": count for bound, count in zip(LATENCY_BUCKETS_US, self.latency)}
+        histogram["inf"] = self.latency[-1]
+        return {
+            "uptime": round(time.time() - self.started),
+            "received": self.received,
+            "bytes_received": self.bytes_received,
+            "accepted": self.accepted,
+            "dropped_source": self.dropped_source,
+            "dropped_severity": self.dropped_severity,
+            "dropped_rule": self.dropped_rule,
+            "decode_errors": self.decode_errors,
+            "severity": dict(zip(MIN_SEVERITY_LEVELS, self.severity)),
+            "latency_p50_us": self.percentile(0.5),
+            "latency_p99_us": self.percentile(0.99),
+            "latency_histogram": histogram,
+            "top_sources": dict(self.sources.top()),
+        }
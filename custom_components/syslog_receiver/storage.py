@@ -0,0 +1,319 @@
+import asyncio
+import json
+import logging
+import mmap
+import os
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+
+_LOGGER = logging.getLogger(__name__)
+
+# The archive is split into this many segment files; the oldest is deleted on rotation
+SEGMENTS = 8
+
+# Write buffered records once this many are pending, or after FLUSH_INTERVAL seconds
+FLUSH_RECORDS = 512
+FLUSH_INTERVAL = 1.0
+
+# One sparse time index entry every SPARSE_EVERY records
+SPARSE_EVERY = 256
+
+# Segments with more distinct sources than this are not source-indexed
+MAX_INDEXED_SOURCES = 1024
+
+# Records buffered in memory at most, if the disk cannot keep up
+MAX_BUFFERED = 50 * FLUSH_RECORDS
+
+# Severity column value for messages without a <PRI> header
+NO_SEVERITY = 9
+
+
+class SegmentIndex:
+    """Time and source index of one segment file."""
+
+    __slots__ = ("first_ts", "last_ts", "sources", "sparse_ts", "sparse_offset", "records")
+
+    def __init__(self):
+        self.first_ts = None
+        self.last_ts = None
+        self.sources = set()
+        self.sparse_ts = []
+        self.sparse_offset = []
+        self.records = 0
+
+    def add(self, ts: float, source: str, offset: int):
+        if self.first_ts is None:
+            self.first_ts = ts
+        self.last_ts = ts
+        if self.sources is not None:
+            self.sources.add(source)
+            if len(self.sources) > MAX_INDEXED_SOURCES:
+                self.sources = None  # too many to be useful, match every source
+        if self.records % SPARSE_EVERY == 0:
+            self.sparse_ts.append(ts)
+            self.sparse_offset.append(offset)
+        self.records += 1
+
+    def may_contain(self, start, end, source) -> bool:
+        if self.first_ts is None:
+            return False
+        if start is not None and self.last_ts < start:
+            return False
+        if end is not None and self.first_ts > end:
+            return False
+        return source is None or self.sources is None or source in self.sources
+
+    def offset_for(self, start) -> int:
+        """File offset from which records at or after `start` can appear."""
+        if start is None or not self.sparse_ts:
+            return 0
+        i = bisect_left(self.sparse_ts, start)
+        return self.sparse_offset[i - 1] if i > 0 else 0
+
+    def to_dict(self) -> dict:
+        return {
+            "first_ts": self.first_ts,
+            "last_ts": self.last_ts,
+            "sources": sorted(self.sources) if self.sources is not None else None,
+            "sparse": list(zip(self.sparse_ts, self.sparse_offset)),
+            "records": self.records,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        index = cls()
+        index.first_ts = data["first_ts"]
+        index.last_ts = data["last_ts"]
+        index.sources = set(data["sources"]) if data["sources"] is not None else None
+        index.sparse_ts = [ts for ts, _ in data["sparse"]]
+        index.sparse_offset = [offset for _, offset in data["sparse"]]
+        index.records = data["records"]
+        return index
+
+
+def _encode(ts: float, event_data: dict) -> bytes:
+    """One record per line: time, severity and source columns, then the event as JSON."""
+    severity = event_data.get("severity")
+    return (
+        f"{ts:.6f}\t{NO_SEVERITY if severity is None else severity}\t{event_data['source_ip']}\t"
+        f"{json.dumps(event_data, ensure_ascii=False, separators=(',', ':'))}\n"
+    ).encode()
+
+
+class MessageStore:
+    """Size-bounded on-disk ring buffer of received messages.
+
+    Records are appended to the newest of at most SEGMENTS segment files; when
+    it reaches its share of the total size a new segment is started and the
+    oldest one is deleted. Every segment has an index of its time range, its
+    sources and a sparse time-to-offset table, kept in memory and written next
+    to the segment when it is closed. Queries skip segments by index and read
+    the remaining ones through mmap.
+
+    add() runs on the event loop and only buffers; writes happen in batches
+    in an executor. All file access is serialized by a lock.
+    """
+
+    def __init__(self, hass, path: str, max_bytes: int):
+        self.hass = hass
+        self.path = path
+        self.segment_bytes = max(max_bytes // SEGMENTS, 64 * 1024)
+        self._lock = threading.Lock()
+        self._segments = []       # [(number, SegmentIndex)], oldest first
+        self._file = None
+        self._size = 0
+        self._buffer = []
+        self._timer = None
+        self._flushing = None     # future of the write in progress
+        self.written = 0
+        self.dropped = 0
+
+    # --- executor side -------------------------------------------------
+
+    def open(self):
+        """Load or rebuild the segment indexes and open the newest segment. Blocking."""
+        os.makedirs(self.path, exist_ok=True)
+        numbers = sorted(
+            int(name[:-4]) for name in os.listdir(self.path)
+            if name.endswith(".log") and name[:-4].isdigit()
+        )
+        with self._lock:
+            for number in numbers:
+                self._segments.append((number, self._load_index(number)))
+            if not self._segments:
+                self._segments.append((1, SegmentIndex()))
+            number, _ = self._segments[-1]
+            self._file = open(self._segment_path(number), "ab")
+            self._size = self._file.tell()
+            if self._size and not self._ends_with_newline(number):
+                # Terminate a record cut short by a crash so the next one starts on its own line
+                self._file.write(b"\n")
+                self._size += 1
+
+    def _ends_with_newline(self, number: int) -> bool:
+        with open(self._segment_path(number), "rb") as file:
+            file.seek(-1, os.SEEK_END)
+            return file.read(1) == b"\n"
+
+    def _segment_path(self, number: int, suffix: str = ".log") -> str:
+        return os.path.join(self.path, f"{number:08d}{suffix}")
+
+    def _load_index(self, number: int) -> SegmentIndex:
+        try:
+            with open(self._segment_path(number, ".idx"), encoding="utf-8") as file:
+                return SegmentIndex.from_dict(json.load(file))
+        except (OSError, ValueError, KeyError):
+            pass
+        # No index (the segment was still open) or a damaged one: rebuild it
+        index = SegmentIndex()
+        offset = 0
+        with open(self._segment_path(number), "rb") as file:
+            for line in file:
+                if line.endswith(b"\n"):
+                    fields = line.split(b"\t", 3)
+                    try:
+                        index.add(float(fields[0]), fields[2].decode(), offset)
+                    except (ValueError, IndexError):
+                        pass
+                offset += len(line)
+        return index
+
+    def write(self, records):
+        """Append encoded records [(ts, source, line)], rotating segments as needed. Blocking."""
+        with self._lock:
+            if self._file is None:
+                return
+            chunk = []
+            _, index = self._segments[-1]
+            for ts, source, line in records:
+                if self._size >= self.segment_bytes:
+                    self._file.write(b"".join(chunk))
+                    chunk = []
+                    index = self._rotate()
+                index.add(ts, source, self._size)
+                chunk.append(line)
+                self._size += len(line)
+            self._file.write(b"".join(chunk))
+            self._file.flush()
+            self.written += len(records)
+
+    def _rotate(self) -> SegmentIndex:
+        number, index = self._segments[-1]
+        self._file.close()
+        with open(self._segment_path(number, ".idx"), "w", encoding="utf-8") as file:
+            json.dump(index.to_dict(), file)
+        while len(self._segments) >= SEGMENTS:
+            old, _ = self._segments.pop(0)
+            for suffix in (".log", ".idx"):
+                try:
+                    os.remove(self._segment_path(old, suffix))
+                except FileNotFoundError:
+                    pass
+        index = SegmentIndex()
+        self._segments.append((number + 1, index))
+        self._file = open(self._segment_path(number + 1), "ab")
+        self._size = 0
+        return index
+
+    def close(self):
+        """Close the active segment. Blocking."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def query(self, start=None, end=None, source=None, max_severity=None, contains=None, limit=100):
+        """Return up to `limit` most recent matching records, oldest first. Blocking."""
+        results = deque(maxlen=limit)
+        needle = contains.encode() if contains else None
+        # A raw byte match is only a valid pre-filter if JSON does not escape the needle
+        raw_needle = needle if contains and not any(c in contains for c in '"\\') and contains.isprintable() else None
+        source_bytes = source.encode() if source else None
+        with self._lock:
+            segments = [(n, i) for n, i in self._segments if i.may_contain(start, end, source)]
+            for number, index in segments:
+                path = self._segment_path(number)
+                try:
+                    size = os.path.getsize(path)
+                except OSError:
+                    continue
+                if not size:
+                    continue
+                with open(path, "rb") as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                    pos = index.offset_for(start)
+                    while pos < size:
+                        newline = data.find(b"\n", pos)
+                        if newline < 0:
+                            break
+                        line = data[pos:newline]
+                        pos = newline + 1
+                        try:
+                            ts_raw, sev_raw, src_raw, payload = line.split(b"\t", 3)
+                            ts = float(ts_raw)
+                        except ValueError:
+                            continue
+                        if start is not None and ts < start:
+                            continue
+                        if end is not None and ts > end:
+                            break
+                        if source_bytes is not None and src_raw != source_bytes:
+                            continue
+                        if max_severity is not None and int(sev_raw) > max_severity:
+                            continue
+                        if raw_needle is not None and raw_needle not in payload:
+                            continue
+                        record = json.loads(payload)
+                        if contains and contains not in (record.get("message") or ""):
+                            continue
+                        record["received"] = ts
+                        results.append(record)
+        return list(results)
+
+    # --- event loop side -----------------------------------------------
+
+    def add(self, event_data: dict):
+        """Buffer a message for the next batched write."""
+        if len(self._buffer) >= MAX_BUFFERED:
+            self.dropped += 1
+            return
+        ts = time.time()
+        self._buffer.append((ts, event_data["source_ip"], _encode(ts, event_data)))
+        if len(self._buffer) >= FLUSH_RECORDS:
+            self._schedule_flush()
+        elif self._timer is None:
+            self._timer = self.hass.loop.call_later(FLUSH_INTERVAL, self._schedule_flush)
+
+    def _schedule_flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flushing is not None or not self._buffer:
+            return
+        records = self._buffer
+        self._buffer = []
+        self._flushing = self.hass.async_add_executor_job(self.write, records)
+        self._flushing.add_done_callback(self._flush_done)
+
+    def _flush_done(self, future):
+        self._flushing = None
+        if not future.cancelled() and future.exception() is not None:
+            _LOGGER.error("Failed to write syslog archive: %s", future.exception())
+        if len(self._buffer) >= FLUSH_RECORDS:
+            self._schedule_flush()
+        elif self._buffer and self._timer is None:
+            self._timer = self.hass.loop.call_later(FLUSH_INTERVAL, self._schedule_flush)
+
+    async def async_close(self):
+        """Write what is still buffered and close the archive."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._flushing is not None:
+            await asyncio.wait([self._flushing])
+        records = self._buffer
+        self._buffer = []
+        if records:
+            await self.hass.async_add_executor_job(self.write, records)
+        await self.hass.async_add_executor_job(self.close)
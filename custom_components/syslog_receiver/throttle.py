@@ -0,0 +1,177 @@
+import zlib
+
+# Control timer period; every CONTROL_TICKS ticks the load is compared with the budgets.
+# The timer is late by the length of any stall of the loop longer than TICK.
+TICK = 0.05
+CONTROL_TICKS = 20
+
+# A level is sampled at 1/2, 1/4, 1/8 of its messages before it is dropped entirely
+SAMPLE_STEPS = 3
+
+# Relax one step once the load has stayed under half the budgets for this many control periods
+RELAX_PERIODS = 5
+
+# Upper bound of tracked sources; the table is cleared when it is full
+MAX_SOURCES = 4096
+
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class AdaptiveThrottle:
+    """Shed low-severity messages step by step while the receiver is over budget.
+
+    Every TICK seconds a timer measures how late it runs (the event loop
+    lag), and every CONTROL_TICKS ticks the rate of messages let through
+    is compared with `rate_budget` (messages/s) and the largest lag with
+    `lag_budget` (seconds); 0 disables a budget. Over either budget the
+    throttle tightens by one step, and it relaxes by one step once both have
+    stayed under half their budget for RELAX_PERIODS periods, so it does not
+    flap between two steps.
+
+    Steps walk down the severities from the minimum severity: the least
+    severe level kept is first sampled at 1/2, then 1/4 and 1/8 of its
+    messages, then dropped, and the next level follows; levels that saw no
+    messages in the last period are skipped. Levels at or above `keep_level`
+    are never throttled. Sampling is deterministic and fair
+    between sources: message n of a source is kept when a hash of the source
+    and n falls under the sampling fraction, so the same traffic gives the
+    same choices, every source keeps its share, and the messages kept at 1/4
+    are a subset of those kept at 1/2.
+    """
+
+    def __init__(self, loop, rate_budget: float, lag_budget: float, keep_level: int, min_level: int):
+        self.loop = loop
+        self.rate_budget = rate_budget
+        self.lag_budget = lag_budget
+        self.keep_level = keep_level
+        self.min_level = min_level
+        self.step = 0
+        self.full_level = min_level   # messages this severe or more pass in full
+        self.sampled_level = None     # the level being sampled, if any
+        self.fraction = 1.0           # fraction of sampled_level let through
+        self._cutoff = 1 << 32
+        self._sources = {}            # source -> [hash seed, messages of the sampled level]
+        self._timer = None
+        self._expected = 0.0
+        self._period_start = 0.0
+        self._ticks = 0
+        self._max_lag = 0.0
+        self._passed = 0
+        self._arrived = [0] * 8       # messages per severity in this control period
+        self._calm = 0
+        self.message_rate = 0.0       # messages/s let through in the last control period
+        self.loop_lag = 0.0           # largest lag in the last control period, seconds
+        self.dropped = 0
+
+    @property
+    def max_step(self) -> int:
+        return max(self.min_level - self.keep_level, 0) * (SAMPLE_STEPS + 1)
+
+    def set_min_level(self, min_level: int):
+        """Follow a new minimum severity, keeping the current step where possible."""
+        self.min_level = min_level
+        self._apply(min(self.step, self.max_step))
+
+    def _level_of(self, step: int) -> int:
+        """The severity whose share changes between step - 1 and step."""
+        return self.min_level - (step - 1) // (SAMPLE_STEPS + 1)
+
+    def _apply(self, step: int):
+        self.step = step
+        dropped_levels, sample_step = divmod(step, SAMPLE_STEPS + 1)
+        level = self.min_level - dropped_levels
+        if sample_step:
+            self.full_level = level - 1
+            self.sampled_level = level
+            self.fraction = 1 / (1 << sample_step)
+            self._cutoff = (1 << 32) >> sample_step
+        else:
+            self.full_level = level
+            self.sampled_level = None
+            self.fraction = 1.0
+            self._cutoff = 1 << 32
+
+    def allow(self, severity, src_ip: str) -> bool:
+        """Return False if the message is throttled away."""
+        if severity is None or severity > self.min_level:
+            # Messages without a <PRI> header passed the severity filter too: they count
+            # as the least severe level it lets through, like messages a worker accepted
+            # just before the minimum severity was raised
+            severity = self.min_level
+        self._arrived[severity] += 1
+        if severity <= self.full_level:
+            self._passed += 1
+            return True
+        if severity != self.sampled_level:
+            self.dropped += 1
+            return False
+
+        source = self._sources.get(src_ip)
+        if source is None:
+            if len(self._sources) >= MAX_SOURCES:
+                self._sources.clear()
+            source = self._sources[src_ip] = [zlib.crc32(src_ip.encode()), 0]
+        source[1] += 1
+        # Fibonacci hashing of (seed + n): evenly spread even for consecutive n
+        if ((source[0] + source[1]) * _GOLDEN & _MASK64) >> 32 < self._cutoff:
+            self._passed += 1
+            return True
+        self.dropped += 1
+        return False
+
+    def start(self):
+        """Start measuring the load."""
+        self._period_start = self.loop.time()
+        self._expected = self._period_start + TICK
+        self._timer = self.loop.call_at(self._expected, self._tick)
+
+    def _tick(self):
+        now = self.loop.time()
+        self._max_lag = max(self._max_lag, now - self._expected)
+        self._ticks += 1
+        if self._ticks >= CONTROL_TICKS:
+            self._control(now)
+        self._expected = now + TICK
+        self._timer = self.loop.call_at(self._expected, self._tick)
+
+    def _control(self, now: float):
+        self.message_rate = self._passed / max(now - self._period_start, TICK)
+        self.loop_lag = self._max_lag
+        arrived = self._arrived
+        self._arrived = [0] * 8
+        self._period_start = now
+        self._ticks = 0
+        self._passed = 0
+        self._max_lag = 0.0
+
+        rate_budget = self.rate_budget
+        lag_budget = self.lag_budget
+        if (rate_budget and self.message_rate > rate_budget) or (lag_budget and self.loop_lag > lag_budget):
+            self._calm = 0
+            step = self.step
+            if step < self.max_step:
+                # Steps on levels that saw no traffic would shed nothing: skip them
+                step += 1
+                while step < self.max_step and not arrived[self._level_of(step)]:
+                    step += 1
+                self._apply(step)
+            return
+        if (rate_budget and self.message_rate > rate_budget / 2) or (lag_budget and self.loop_lag > lag_budget / 2):
+            self._calm = 0
+            return
+        self._calm += 1
+        if self._calm >= RELAX_PERIODS and self.step:
+            self._calm = 0
+            step = self.step - 1
+            while step and not arrived[self._level_of(step)]:
+                step -= 1
+            self._apply(step)
+            if not step:
+                self._sources.clear()
+
+    def close(self):
+        """Stop the control timer."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
@@ -0,0 +1,117 @@
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter_ns
+
+_LOGGER = logging.getLogger(__name__)
+
+# Messages waiting for one worker before new ones are shed
+MAX_BACKLOG = 20000
+
+# Pipeline of a process worker, installed once by the pool initializer
+_process_pipeline = None
+
+# Start workers from a clean interpreter: forking the multi-threaded Home
+# Assistant process can deadlock the child and copies all of its memory
+_START_METHOD = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def prepare_batch(pipeline, items):
+    """Run FilterPipeline.prepare over [(data, src_ip)] and time every message."""
+    results = []
+    for data, src_ip in items:
+        start = perf_counter_ns()
+        event_data = pipeline.prepare(data, src_ip)
+        results.append((event_data, perf_counter_ns() - start))
+    return results
+
+
+def _init_process(pipeline):
+    global _process_pipeline
+    _process_pipeline = pipeline
+
+
+def _prepare_in_process(items):
+    return prepare_batch(_process_pipeline, items)
+
+
+class WorkerPool:
+    """Decode, parse and filter received messages in worker processes.
+
+    Messages are sharded by source address over `count` single-process
+    executors, so every source is always handled by the same worker and its
+    messages stay in order. Each shard has at most one batch in flight: what
+    arrives meanwhile is collected and sent as the next batch as soon as the
+    previous one is back, so batches grow with the load. Each finished batch
+    comes back to the loop as a single `deliver(results)` call.
+
+    The pipeline is sent to the workers when the pool is created and again by
+    set_pipeline(), as a task queued behind the batches already sent.
+    """
+
+    def __init__(self, loop, count: int, pipeline, deliver):
+        self.loop = loop
+        self.count = max(count, 1)
+        self.pipeline = pipeline
+        self.deliver = deliver
+        context = multiprocessing.get_context(_START_METHOD)
+        self._executors = [
+            ProcessPoolExecutor(max_workers=1, mp_context=context, initializer=_init_process, initargs=(pipeline,))
+            for _ in range(self.count)
+        ]
+        self._pending = [[] for _ in range(self.count)]
+        self._in_flight = [False] * self.count
+        self._scheduled = False
+        self._closed = False
+        self.dropped = 0
+
+    def set_pipeline(self, pipeline):
+        """Use a new pipeline for the batches sent from now on; batches in flight finish with the old one."""
+        self.pipeline = pipeline
+        # Each worker runs its tasks in order, so this lands between two batches
+        for executor in self._executors:
+            executor.submit(_init_process, pipeline)
+
+    def submit(self, data: bytes, src_ip: str):
+        """Queue a message for the worker of its source."""
+        shard = hash(src_ip) % self.count
+        pending = self._pending[shard]
+        if len(pending) >= MAX_BACKLOG:
+            self.dropped += 1
+            return
+        pending.append((data, src_ip))
+        if not self._in_flight[shard] and not self._scheduled:
+            # Send at the end of this loop iteration, together with whatever else arrives
+            self._scheduled = True
+            self.loop.call_soon(self._flush)
+
+    def _flush(self):
+        self._scheduled = False
+        for shard in range(self.count):
+            if self._pending[shard] and not self._in_flight[shard]:
+                self._send(shard)
+
+    def _send(self, shard: int):
+        items = self._pending[shard]
+        self._pending[shard] = []
+        self._in_flight[shard] = True
+        future = self.loop.run_in_executor(self._executors[shard], _prepare_in_process, items)
+        future.add_done_callback(lambda fut: self._done(fut, shard, len(items)))
+
+    def _done(self, future, shard: int, size: int):
+        self._in_flight[shard] = False
+        if self._closed or future.cancelled():
+            return
+        if future.exception() is not None:
+            self.dropped += size
+            _LOGGER.error("Syslog worker failed on a batch of %s messages: %s", size, future.exception())
+        else:
+            self.deliver(future.result())
+        if self._pending[shard]:
+            self._send(shard)
+
+    def close(self):
+        """Stop the workers, discarding messages that have not been processed yet."""
+        self._closed = True
+        for executor in self._executors:
+            executor.shutdown(wait=False, cancel_futures=True)
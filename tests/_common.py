@@ -0,0 +1,66 @@
+"""Shared helpers for the syslog_receiver unit tests.
+
+Like the benchmarks, the tests run without a Home Assistant install: the
+integration package is registered without executing its ``__init__`` (which
+imports Home Assistant), and its modules are imported from there.
+"""
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parent.parent / "custom_components" / "syslog_receiver"
+PACKAGE = "syslog_receiver"
+
+
+def load_module(name: str):
+    """Import ``syslog_receiver.<name>`` without running the package __init__."""
+    if PACKAGE not in sys.modules:
+        spec = importlib.util.spec_from_file_location(
+            PACKAGE,
+            PACKAGE_DIR / "__init__.py",
+            submodule_search_locations=[str(PACKAGE_DIR)],
+        )
+        sys.modules[PACKAGE] = importlib.util.module_from_spec(spec)
+    return importlib.import_module(f"{PACKAGE}.{name}")
+
+
+class FakeLoop:
+    """Clock and timer stand-in; tests move `now` and run due timers themselves."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.timers = []
+
+    def time(self):
+        return self.now
+
+    def call_at(self, when, callback, *args):
+        handle = FakeTimer(when, callback, args)
+        self.timers.append(handle)
+        return handle
+
+    def call_later(self, delay, callback, *args):
+        return self.call_at(self.now + delay, callback, *args)
+
+    def advance(self, seconds: float):
+        """Move the clock and run the timers that became due, in order."""
+        self.now += seconds
+        while True:
+            due = [t for t in self.timers if not t.cancelled and t.when <= self.now]
+            if not due:
+                return
+            timer = min(due, key=lambda t: t.when)
+            self.timers.remove(timer)
+            timer.callback(*timer.args)
+
+
+class FakeTimer:
+    def __init__(self, when, callback, args):
+        self.when = when
+        self.callback = callback
+        self.args = args
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
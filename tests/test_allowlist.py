@@ -0,0 +1,74 @@
+"""Tests for the allowed IPs matcher."""
+import ipaddress
+
+from _common import load_module
+
+allowlist = load_module("allowlist")
+AllowList = allowlist.AllowList
+
+
+def test_empty_list_allows_everyone():
+    allowed = AllowList("")
+    assert not allowed
+    assert "203.0.113.9" in allowed
+    assert "not an address" in allowed
+
+
+def test_single_hosts_and_ranges():
+    allowed = AllowList("192.168.1.5, 10.0.0.0/8, 2001:db8::/32")
+    assert "192.168.1.5" in allowed
+    assert "192.168.1.6" not in allowed
+    assert "10.255.255.255" in allowed
+    assert "11.0.0.0" not in allowed
+    assert "2001:db8:1::42" in allowed
+    assert "2001:db9::1" not in allowed
+
+
+def test_ipv4_mapped_sender_matches_ipv4_range():
+    allowed = AllowList("10.0.0.0/24")
+    assert "::ffff:10.0.0.7" in allowed
+    assert "::ffff:10.0.1.7" not in allowed
+
+
+def test_ipv4_mapped_range_is_an_ipv4_range():
+    networks, invalid = allowlist.parse_allowed_ips("::ffff:10.0.0.0/104")
+    assert invalid == []
+    assert networks == [ipaddress.ip_network("10.0.0.0/8")]
+    assert "10.1.2.3" in AllowList("::ffff:10.0.0.0/104")
+
+
+def test_scoped_sender_matches_without_scope():
+    allowed = AllowList("fe80::/64")
+    assert "fe80::1%eth0" in allowed
+
+
+def test_invalid_entries_are_reported_and_ignored():
+    networks, invalid = allowlist.parse_allowed_ips("10.0.0.1, 10.0.0.300, , host.lan")
+    assert networks == [ipaddress.ip_network("10.0.0.1/32")]
+    assert invalid == ["10.0.0.300", "host.lan"]
+
+
+def test_all_invalid_list_allows_nobody():
+    # A mistyped list must not open the filter
+    allowed = AllowList("10.0.0.300, host.lan")
+    assert allowed
+    assert "10.0.0.1" not in allowed
+
+
+def test_unparsable_sender_is_rejected():
+    assert "garbage" not in AllowList("10.0.0.0/8")
+
+
+def test_adjacent_and_overlapping_ranges_are_collapsed():
+    allowed = AllowList("10.0.0.0/25, 10.0.0.128/25, 10.0.0.5, 192.168.0.0/16")
+    assert allowed._starts[4] == [int(ipaddress.ip_address("10.0.0.0")), int(ipaddress.ip_address("192.168.0.0"))]
+    assert allowed._ends[4] == [int(ipaddress.ip_address("10.0.0.255")), int(ipaddress.ip_address("192.168.255.255"))]
+    assert "10.0.0.200" in allowed
+    assert "10.0.1.0" not in allowed
+
+
+def test_results_are_cached_per_source():
+    allowed = AllowList("10.0.0.0/8")
+    assert "10.1.1.1" in allowed
+    assert allowed._cache == {"10.1.1.1": True}
+    assert "10.1.1.1" in allowed
@@ -0,0 +1,106 @@
+"""Tests for duplicate suppression."""
+from _common import FakeLoop, load_module
+
+Deduplicator = load_module("dedup").Deduplicator
+
+
+def event(body="link down", source_ip="10.0.0.1", severity=4, app_name="netd", n=0):
+    return {
+        "message": f"Oct 11 22:14:{n:02d} sw1 {app_name}: {body}",
+        "body": body,
+        "source_ip": source_ip,
+        "severity": severity,
+        "app_name": app_name,
+        "n": n,
+    }
+
+
+def make(window=10, max_entries=100):
+    emitted = []
+    dedup = Deduplicator(FakeLoop(), window, max_entries, lambda event_type, data: emitted.append((event_type, data)))
+    return dedup, emitted
+
+
+def test_first_copy_passes_and_repeats_are_summarized():
+    dedup, emitted = make()
+    assert not dedup.seen("syslog_receiver_message", event(n=0))
+    assert dedup.seen("syslog_receiver_message", event(n=1))
+    assert dedup.seen("syslog_receiver_message", event(n=2))
+    assert emitted == []
+    assert dedup.suppressed == 2
+
+    dedup.loop.advance(10)
+    assert len(emitted) == 1
+    event_type, data = emitted[0]
+    assert event_type == "syslog_receiver_message"
+    assert data["repeat_count"] == 2
+    assert data["n"] == 2  # the last copy stands for the others
+
+    # The window is closed: the next copy passes again
+    assert not dedup.seen("syslog_receiver_message", event(n=3))
+
+
+def test_single_message_emits_no_summary():
+    dedup, emitted = make()
+    assert not dedup.seen("syslog_receiver_message", event())
+    dedup.loop.advance(10)
+    assert emitted == []
+
+
+def test_whitespace_and_timestamps_do_not_matter():
+    dedup, _ = make()
+    assert not dedup.seen("syslog_receiver_message", event(body="link  down", n=0))
+    assert dedup.seen("syslog_receiver_message", event(body=" link down ", n=30))
+
+
+def test_source_severity_and_app_name_are_part_of_the_key():
+    dedup, _ = make()
+    assert not dedup.seen("syslog_receiver_message", event())
+    assert not dedup.seen("syslog_receiver_message", event(source_ip="10.0.0.2"))
+    assert not dedup.seen("syslog_receiver_message", event(severity=3))
+    assert not dedup.seen("syslog_receiver_message", event(app_name="other"))
+
+
+def test_summary_does_not_modify_the_absorbed_event():
+    dedup, emitted = make()
+    dedup.seen("syslog_receiver_message", event(n=0))
+    last = event(n=1)
+    dedup.seen("syslog_receiver_message", last)
+    dedup.loop.advance(10)
+    assert "repeat_count" not in last
+    assert emitted[0][1] is not last
+
+
+def test_windows_expire_in_order():
+    dedup, emitted = make(window=10)
+    dedup.seen("syslog_receiver_message", event(body="a"))
+    dedup.loop.advance(4)
+    dedup.seen("syslog_receiver_message", event(body="b"))
+    dedup.seen("syslog_receiver_message", event(body="a"))
+    dedup.seen("syslog_receiver_message", event(body="b"))
+
+    dedup.loop.advance(6)
+    assert [data["body"] for _, data in emitted] == ["a"]
+    dedup.loop.advance(4)
+    assert [data["body"] for _, data in emitted] == ["a", "b"]
+
+
+def test_full_table_evicts_the_oldest_window_early():
+    dedup, emitted = make(max_entries=2)
+    dedup.seen("syslog_receiver_message", event(body="a"))
+    dedup.seen("syslog_receiver_message", event(body="a"))
+    dedup.seen("syslog_receiver_message", event(body="b"))
+    dedup.seen("syslog_receiver_message", event(body="c"))
+    # "a" was evicted to make room for "c", and its repeat emitted at once
+    assert [(data["body"], data["repeat_count"]) for _, data in emitted] == [("a", 1)]
+    assert len(dedup._table) == 2
+    assert not dedup.seen("syslog_receiver_message", event(body="a"))
+
+
+def test_close_emits_pending_repeats():
+    dedup, emitted = make()
+    dedup.seen("syslog_receiver_critical", event())
+    dedup.seen("syslog_receiver_critical", event())
+    dedup.close()
+    assert [(event_type, data["repeat_count"]) for event_type, data in emitted] == [("syslog_receiver_critical", 1)]
+    assert not dedup._table
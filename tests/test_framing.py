@@ -0,0 +1,76 @@
+"""Tests for the RFC 6587 TCP frame decoder."""
+from _common import load_module
+
+FrameDecoder = load_module("framing").FrameDecoder
+
+
+def feed(decoder, *chunks):
+    """Feed chunks and collect the frames as bytes (the memoryviews are only valid until the next one)."""
+    frames = []
+    for chunk in chunks:
+        frames.extend(bytes(frame) for frame in decoder.feed(chunk))
+    return frames
+
+
+def test_newline_frames_strip_cr_and_skip_empty_lines():
+    decoder = FrameDecoder(1024)
+    assert feed(decoder, b"<14>one\r\n<14>two\n\n<14>three") == [b"<14>one", b"<14>two"]
+    assert decoder.pending
+    assert feed(decoder, b"\n") == [b"<14>three"]
+    assert not decoder.pending
+
+
+def test_octet_counted_frames_may_contain_newlines():
+    decoder = FrameDecoder(1024)
+    assert feed(decoder, b"11 <14>a\nb\nc d10 <14>second") == [b"<14>a\nb\nc d", b"<14>second"]
+
+
+def test_octet_and_newline_framing_mixed_on_one_stream():
+    decoder = FrameDecoder(1024)
+    assert feed(decoder, b"7 <14>abc<14>line\n5 <14>x") == [b"<14>abc", b"<14>line", b"<14>x"]
+
+
+def test_frames_split_across_chunks():
+    decoder = FrameDecoder(1024)
+    assert feed(decoder, b"1", b"5 <14>hel", b"lo wo", b"rld<13>ne", b"wline\n") == [
+        b"<14>hello world",
+        b"<13>newline",
+    ]
+
+
+def test_digits_without_a_length_prefix_are_a_newline_frame():
+    decoder = FrameDecoder(1024)
+    assert feed(decoder, b"2024x is not a length\n") == [b"2024x is not a length"]
+
+
+def test_oversized_newline_frame_is_truncated_and_its_tail_discarded():
+    decoder = FrameDecoder(8)
+    assert feed(decoder, b"0123456789ab", b"cdef", b"ghi\n<14>ok\n") == [b"01234567", b"<14>ok"]
+    assert decoder.truncated == 1
+
+
+def test_oversized_octet_frame_is_truncated_and_the_rest_skipped():
+    decoder = FrameDecoder(8)
+    assert feed(decoder, b"20 0123456789", b"abcde", b"fghij5 <14>x") == [b"01234567", b"<14>x"]
+    assert decoder.truncated == 1
+    assert not decoder.pending
+
+
+def test_flush_keeps_a_trailing_newline_frame():
+    decoder = FrameDecoder(1024)
+    assert feed(decoder, b"<14>first\n<14>last\r") == [b"<14>first"]
+    assert list(decoder.flush()) == [b"<14>last"]
+    assert not decoder.pending
+
+
+def test_flush_drops_an_incomplete_octet_frame():
+    decoder = FrameDecoder(1024)
+    assert feed(decoder, b"50 <14>cut short") == []
+    assert list(decoder.flush()) == []
+    assert not decoder.pending
+
+
+def test_flush_after_a_discarded_line_yields_nothing():
+    decoder = FrameDecoder(4)
+    assert feed(decoder, b"abcdefgh") == [b"abcd"]
+    assert list(decoder.flush()) == []
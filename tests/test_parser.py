@@ -0,0 +1,93 @@
+"""Tests for the RFC 5424 / RFC 3164 header parser."""
+from _common import load_module
+
+parser = load_module("parser")
+parse = parser.parse
+
+
+def test_rfc5424_with_structured_data():
+    text = (
+        '1 2025-10-11T22:14:15.003Z router.lan sshd 4123 AUTH '
+        '[origin@32473 ip="10.0.0.1" note="a \\"quoted\\" \\] value"][meta@1 seq="7"] ﻿Login failed'
+    )
+    assert parse(text) == {
+        "format": "rfc5424",
+        "timestamp": "2025-10-11T22:14:15.003Z",
+        "hostname": "router.lan",
+        "app_name": "sshd",
+        "procid": "4123",
+        "msgid": "AUTH",
+        "structured_data": {
+            "origin@32473": {"ip": "10.0.0.1", "note": 'a "quoted" ] value'},
+            "meta@1": {"seq": "7"},
+        },
+        "body": "Login failed",
+    }
+
+
+def test_rfc5424_nil_values():
+    assert parse("1 - - - - - - hello") == {
+        "format": "rfc5424",
+        "timestamp": None,
+        "hostname": None,
+        "app_name": None,
+        "procid": None,
+        "msgid": None,
+        "structured_data": None,
+        "body": "hello",
+    }
+
+
+def test_rfc5424_needs_a_timestamp_and_structured_data_field():
+    for text in ("1 apple banana cherry date egg fig", "1 - host app - - hello"):
+        result = parse(text)
+        assert result["format"] is None
+        assert result["body"] == text
+
+
+def test_structured_data_is_a_new_dict_per_event():
+    text = '1 - host app - - [x@1 a="b"] msg'
+    first = parse(text)
+    first["structured_data"]["x@1"]["a"] = "changed"
+    second = parse(text)
+    assert second["structured_data"] == {"x@1": {"a": "b"}}
+    assert second["structured_data"] is not first["structured_data"]
+
+
+def test_rfc3164_with_hostname_and_pid():
+    assert parse("Oct 11 22:14:15 mymachine su[230]: 'su root' failed on /dev/pts/8") == {
+        "format": "rfc3164",
+        "timestamp": "Oct 11 22:14:15",
+        "hostname": "mymachine",
+        "app_name": "su",
+        "procid": "230",
+        "msgid": None,
+        "structured_data": None,
+        "body": "'su root' failed on /dev/pts/8",
+    }
+
+
+def test_rfc3164_without_hostname():
+    # pfSense and Ubiquiti start with the tag right after the timestamp
+    result = parse("Oct  1 08:00:01 filterlog[4321]: 5,,,1000000103,igb0,match,block,in")
+    assert result["hostname"] is None
+    assert result["app_name"] == "filterlog"
+    assert result["procid"] == "4321"
+    assert result["timestamp"] == "Oct  1 08:00:01"
+    assert result["body"] == "5,,,1000000103,igb0,match,block,in"
+
+
+def test_rfc3164_with_iso_timestamp_and_no_tag():
+    result = parse("2025-10-11T22:14:15+02:00 nas kernel message without tag")
+    assert result["format"] == "rfc3164"
+    assert result["timestamp"] == "2025-10-11T22:14:15+02:00"
+    assert result["hostname"] == "nas"
+    assert result["app_name"] is None
+    assert result["body"] == "kernel message without tag"
+
+
+def test_unknown_format_keeps_the_text_as_body():
+    result = parse("just some text")
+    assert result["format"] is None
+    assert result["timestamp"] is None
+    assert result["body"] == "just some text"
@@ -0,0 +1,118 @@
+"""Tests for routing rule parsing and matching."""
+from _common import load_module
+
+rules = load_module("rules")
+parse_rules = rules.parse_rules
+RuleSet = rules.RuleSet
+
+
+def event(message="hello", source_ip="10.0.0.1", severity=6, facility=1, hostname=None, app_name=None):
+    return {
+        "message": message,
+        "source_ip": source_ip,
+        "severity": severity,
+        "facility": facility,
+        "hostname": hostname,
+        "app_name": app_name,
+    }
+
+
+def compile_rules(raw):
+    parsed, invalid = parse_rules(raw)
+    assert invalid == []
+    return RuleSet(parsed)
+
+
+def test_parse_quoted_keyword_and_separators():
+    parsed, invalid = parse_rules('app_name=sshd keyword="Failed password" -> ssh_login\nseverity<=crit -> critical')
+    assert invalid == []
+    assert [rule.action for rule in parsed] == ["ssh_login", "critical"]
+    assert parsed[0].exact == {"app_name": frozenset({"sshd"})}
+    assert parsed[0].keyword == "Failed password"
+    assert parsed[1].severities == frozenset({0, 1, 2})
+
+
+def test_parse_facility_names_and_value_lists():
+    (rule,), _ = parse_rules("facility=local0,4 hostname=a,b -> x")
+    assert rule.exact == {"facility": frozenset({16, 4}), "hostname": frozenset({"a", "b"})}
+
+
+def test_invalid_rules_are_reported():
+    parsed, invalid = parse_rules(
+        "severity=loud -> x; hostname<=a -> x; app_name=a -> Bad-Name; regex=( -> x; "
+        "source=host.lan -> x; keyword=a; facility=nope -> x; app_name=ok -> fine"
+    )
+    assert [rule.action for rule in parsed] == ["fine"]
+    assert len(invalid) == 7
+
+
+def test_unbalanced_quotes_invalidate_everything():
+    parsed, invalid = parse_rules('keyword="open -> x; app_name=a -> y')
+    assert parsed == []
+    assert invalid == ['keyword="open -> x; app_name=a -> y']
+
+
+def test_first_matching_rule_wins():
+    ruleset = compile_rules("app_name=sshd -> ssh; severity<=err -> errors; keyword=fail -> failures")
+    assert ruleset.route(event(app_name="sshd", severity=3, message="fail")) == "syslog_receiver_ssh"
+    assert ruleset.route(event(severity=3, message="fail")) == "syslog_receiver_errors"
+    assert ruleset.route(event(severity=5, message="login fail")) == "syslog_receiver_failures"
+    assert ruleset.route(event(severity=5)) == "syslog_receiver_message"
+
+
+def test_all_conditions_must_hold():
+    ruleset = compile_rules('source=10.0.0.9 keyword="link" severity<=warning -> link')
+    assert ruleset.route(event(source_ip="10.0.0.9", message="link down", severity=4)) == "syslog_receiver_link"
+    assert ruleset.route(event(source_ip="10.0.0.9", message="link down", severity=5)) == "syslog_receiver_message"
+    assert ruleset.route(event(source_ip="10.0.0.8", message="link down", severity=4)) == "syslog_receiver_message"
+    assert ruleset.route(event(source_ip="10.0.0.9", message="port down", severity=4)) == "syslog_receiver_message"
+
+
+def test_drop_action_returns_none():
+    ruleset = compile_rules('regex="link (up|down)" -> drop')
+    assert ruleset.route(event(message="eth0 link up")) is None
+    assert ruleset.route(event(message="eth0 link flapping")) == "syslog_receiver_message"
+
+
+def test_messages_without_severity_only_match_rules_without_severity():
+    ruleset = compile_rules("severity<=debug -> any_level; keyword=x -> keyword")
+    assert ruleset.route(event(severity=None, message="x")) == "syslog_receiver_keyword"
+
+
+def test_overlapping_keywords_each_select_their_rule():
+    ruleset = compile_rules("keyword=error -> a; keyword=terror -> b; keyword=or -> c")
+    assert ruleset.route(event(message="terror")) == "syslog_receiver_a"
+    assert ruleset.route(event(message="horror")) == "syslog_receiver_c"
+    assert ruleset.route(event(message="none")) == "syslog_receiver_message"
+
+
+def test_regexes_with_backreferences_are_matched_one_by_one():
+    ruleset = compile_rules(r'regex="(\w+) \1" -> repeated; regex="^boot" -> boot')
+    assert ruleset._combined is None
+    assert ruleset.route(event(message="again again")) == "syslog_receiver_repeated"
+    assert ruleset.route(event(message="boot done")) == "syslog_receiver_boot"
+    assert ruleset.route(event(message="once only")) == "syslog_receiver_message"
+
+
+def test_source_matches_ipv4_mapped_senders():
+    ruleset = compile_rules("source=10.0.0.5,2001:DB8::1 -> dev")
+    assert ruleset.route(event(source_ip="10.0.0.5")) == "syslog_receiver_dev"
+    assert ruleset.route(event(source_ip="::ffff:10.0.0.5")) == "syslog_receiver_dev"
+    assert ruleset.route(event(source_ip="2001:db8::1")) == "syslog_receiver_dev"
+    assert ruleset.route(event(source_ip="10.0.0.6")) == "syslog_receiver_message"
+
+
+def test_empty_ruleset_is_false():
+    assert not RuleSet([])
+
+
+def test_backreference_is_not_renumbered_by_an_earlier_group():
+    ruleset = compile_rules(r'regex="(x)" -> has_x; regex="(\w+) \1" -> repeated')
+    assert ruleset.route(event(message="hello hello")) == "syslog_receiver_repeated"
+    assert ruleset.route(event(message="x")) == "syslog_receiver_has_x"
+
+
+def test_same_group_name_in_two_patterns():
+    ruleset = compile_rules('regex="(?P<n>up)" -> up; regex="(?P<n>down)" -> down')
+    assert ruleset._combined is None
+    assert ruleset.route(event(message="link down")) == "syslog_receiver_down"
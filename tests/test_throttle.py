@@ -0,0 +1,121 @@
+"""Tests for the adaptive throttle."""
+import pytest
+
+from _common import FakeLoop, load_module
+
+throttle = load_module("throttle")
+
+INFO, NOTICE, WARNING, ERR, DEBUG = 6, 5, 4, 3, 7
+
+
+def make(rate_budget=1000, lag_budget=0, keep_level=ERR, min_level=INFO):
+    return throttle.AdaptiveThrottle(FakeLoop(), rate_budget, lag_budget, keep_level, min_level)
+
+
+def run_period(t, counts, source="10.0.0.1"):
+    """Offer {severity: n} messages during one second, then run the control step."""
+    for severity, n in counts.items():
+        for _ in range(n):
+            t.allow(severity, source)
+    t.loop.now += 1.0
+    t._control(t.loop.now)
+
+
+def test_everything_passes_without_load():
+    t = make()
+    assert t.step == 0
+    assert t.allow(None, "1.2.3.4")
+    assert t.allow(INFO, "1.2.3.4")
+    assert t.allow(ERR, "1.2.3.4")
+    assert t.dropped == 0
+
+
+def test_message_below_min_level_passes_without_load():
+    # A worker may deliver a message accepted just before min_severity was raised
+    t = make(min_level=NOTICE)
+    assert t.allow(INFO, "1.2.3.4")
+    assert t.dropped == 0
+
+
+def test_tightens_one_step_over_budget():
+    t = make(rate_budget=100)
+    run_period(t, {INFO: 1000})
+    assert t.step == 1
+    assert t.sampled_level == INFO
+    assert t.fraction == 0.5
+    assert t.full_level == NOTICE
+
+    kept = sum(t.allow(INFO, "10.0.0.1") for _ in range(1000))
+    assert 400 < kept < 600
+    assert t.allow(NOTICE, "10.0.0.1")
+
+
+def test_headerless_messages_are_sampled_with_the_min_level():
+    t = make(rate_budget=100)
+    run_period(t, {None: 1000})
+    assert t.sampled_level == INFO
+    kept = sum(t.allow(None, "10.0.0.1") for _ in range(1000))
+    assert 400 < kept < 600
+
+
+def test_never_throttles_keep_level():
+    t = make(rate_budget=100)
+    for _ in range(t.max_step + 5):
+        run_period(t, {INFO: 500, NOTICE: 500, WARNING: 500, ERR: 500})
+    assert t.step == t.max_step
+    assert t.full_level == ERR
+    assert not t.allow(WARNING, "10.0.0.1")
+    assert all(t.allow(ERR, "10.0.0.1") for _ in range(100))
+
+
+def test_skips_levels_without_traffic():
+    t = make(rate_budget=100, min_level=DEBUG)
+    run_period(t, {INFO: 1000})
+    # Sampling and dropping debug would shed nothing: go straight to info at 1/2
+    assert t.sampled_level == INFO
+    assert t.fraction == 0.5
+
+
+def test_relaxes_after_calm_periods():
+    t = make(rate_budget=100)
+    run_period(t, {INFO: 1000})
+    run_period(t, {INFO: 1000})
+    assert t.step == 2
+
+    for _ in range(throttle.RELAX_PERIODS - 1):
+        run_period(t, {INFO: 10})
+    assert t.step == 2
+    run_period(t, {INFO: 10})
+    assert t.step == 1
+
+    for _ in range(throttle.RELAX_PERIODS):
+        run_period(t, {INFO: 10})
+    assert t.step == 0
+    assert t.allow(INFO, "10.0.0.1")
+
+
+def test_does_not_relax_between_half_and_full_budget():
+    t = make(rate_budget=100)
+    run_period(t, {INFO: 1000})
+    for _ in range(throttle.RELAX_PERIODS * 2):
+        run_period(t, {NOTICE: 70})
+    assert t.step == 1
+
+
+def test_tightens_on_loop_lag():
+    t = make(rate_budget=0, lag_budget=0.1)
+    t._max_lag = 0.5
+    run_period(t, {INFO: 10})
+    assert t.step == 1
+    assert t.loop_lag == 0.5
+
+
+@pytest.mark.parametrize("step", [1, 2, 3])
+def test_sampling_is_deterministic_and_nested(step):
+    def kept_at(s):
+        t = make()
+        t._apply(s)
+        return {n for n in range(2000) if t.allow(INFO, "10.0.0.1")}
+
+    assert kept_at(step) == kept_at(step)
+    assert kept_at(step + 1) <= kept_at(step)